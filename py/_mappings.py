@@ -0,0 +1,39 @@
+"""
+Adaptive Prompts: _mappings
+GENERATED by tools/gen_mappings.py -- do not edit by hand.
+
+Edit a node's DISPLAY_NAME (or NODE_TABLE in the generator) and re-run it.
+"""
+
+import sys
+
+# (node_name, module (relative to this package), class_name, display_name)
+_NODES_RAW = (
+    ("PromptGenerator", "prompt_generator", "PromptGenerator", "Prompt Generator 💡"),
+    ("PromptGeneratorAdvanced", "prompt_generator", "PromptGeneratorAdvanced", "Prompt Generator 💡 (Advanced)"),
+    ("PromptSequencer", "prompt_sequencer", "PromptSequencer", "Prompt Sequencer 🎞️"),
+    ("PromptRepack", "prompt_repack", "PromptRepack", "Prompt Repack 📦"),
+    ("PromptAliasSwap", "prompt_alias", "PromptAliasSwap", "Prompt Alias Swap 📚"),
+    ("PromptReplace", "prompt_replace", "PromptReplace", "Prompt Replace 🔁"),
+    ("WeightLifter", "weight_lifter", "WeightLifter", "Weight Lifter 🏋️‍♀️"),
+    ("PromptSplitter", "prompt_splitter", "PromptSplitter", "Prompt Splitter ✂️"),
+    ("PromptMixer", "prompt_mixer", "PromptMixer", "Prompt Mixer 🥣"),
+    ("PromptShuffle", "prompt_shuffle", "PromptShuffle", "Prompt Shuffle ♻️"),
+    ("PromptShuffleAdvanced", "prompt_shuffle", "PromptShuffleAdvanced", "Prompt Shuffle ♻️ (Advanced)"),
+    ("PromptContextMerge", "prompt_generator", "PromptContextMerge", "Prompt Context Merge"),
+    ("PromptCleanup", "string_utils", "PromptCleanup", "Prompt Cleanup 🧹"),
+    ("NormalizeLoraTags", "misc_utils", "LoraTagNormalizer", "Normalize Lora Tags 🟰"),
+    ("StringSplit", "string_utils", "StringSplit", "String Split ⛓️‍💥"),
+    ("StringAppend3", "string_utils", "StringAppend3", "String Append 🔗"),
+    ("StringAppend8", "string_utils", "StringAppend8", "String Append 🔗"),
+    ("ScaledSeedGenerator", "misc_utils", "ScaledSeedGenerator", "Scaled Seed Generator 🌱"),
+    ("TagCounter", "misc_utils", "TagCounter", "Tag Counter"),
+    ("SaveImageAndText", "image_nodes", "SaveImageAndText", "Save Image And Text"),
+    ("RandomFloats", "math_utils", "RandomFloats4", "Random Floats 4"),
+    ("RandomIntegers", "math_utils", "RandomIntegers4", "Random Integers 4"),
+)
+
+# interned so every registry holding these names/labels shares one object
+NODES = tuple(tuple(map(sys.intern, row)) for row in _NODES_RAW)
+
+NODE_DISPLAY_NAME_MAPPINGS = {n: d for n, _, _, d in NODES}
@@ -0,0 +1,90 @@
+"""
+Adaptive Prompts: _registry
+Lazy node mappings and registration for the package __init__.py
+
+The node table itself lives in _mappings.py, generated by tools/gen_mappings.py
+from each class's DISPLAY_NAME.
+
+Node classes are never imported here; mappings resolve them on first lookup so
+heavy dependencies (PIL, torch, numpy) are only loaded when a node needs them.
+"""
+
+import functools
+import importlib
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from ._mappings import NODES, NODE_DISPLAY_NAME_MAPPINGS
+
+
+def resolve_class(module: str, cls_name: str):
+    """
+    Import 'module' (relative to this package) and return its 'cls_name' attribute.
+    """
+    mod = importlib.import_module(f".{module}", __package__)
+    return getattr(mod, cls_name)
+
+
+class _LazyMapping(Mapping):
+    """
+    Mapping of node name -> node class that resolves each class on demand.
+    The (module, class_name) pairs stay in a private dict: iterating keys never
+    imports anything, and every lookup (including the Mapping mixins behind
+    dict(m), {**m}, ==, values() and items()) only imports the submodules it touches.
+    """
+
+    def __init__(self, entries):
+        self._entries = dict(entries)
+
+    def __getitem__(self, key):
+        return resolve_class(*self._entries[key])
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        # membership must not import the node's module
+        return key in self._entries
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+@functools.lru_cache(maxsize=1)
+def get_mappings():
+    """
+    Returns (NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS), built once per process.
+    Both are read-only views. Lookups, iteration and copies of the class mapping
+    (copy(), dict(m), {**m}) all yield node classes, importing only on lookup.
+    """
+    class_mappings = MappingProxyType(_LazyMapping({n: (m, c) for n, m, c, _ in NODES}))
+    display_mappings = MappingProxyType(NODE_DISPLAY_NAME_MAPPINGS)
+    return class_mappings, display_mappings
+
+
+def register_nodes(comfy):
+    """
+    Register every node with 'comfy', preferring (in order) lazy registration,
+    a single bulk call, and finally one register_node call per node.
+    """
+    lazy = getattr(comfy, "register_node_lazy", None)
+    if lazy is not None:
+        # NODES is an import-free literal, so nothing is imported here
+        for name, module, cls_name, display in NODES:
+            lazy(name, f"{__package__}.{module}", cls_name, display_name=display)
+        return
+
+    bulk = getattr(comfy, "register_nodes_bulk", None)
+    if bulk is not None:
+        bulk(*get_mappings())
+        return
+
+    register = comfy.register_node
+    for _, module, cls_name, display in NODES:
+        register(resolve_class(module, cls_name), display_name=display)
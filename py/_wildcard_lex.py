@@ -0,0 +1,137 @@
+"""
+Adaptive Prompts: _wildcard_lex
+Hand-written scanners for wildcard tokens and ##comment## blocks
+
+These mirror generator.FILE_PATTERN (search semantics) and the ##(.*?)## comment
+pattern exactly, but jump between candidate positions with str.find instead of
+running the regex engine over the whole prompt.
+"""
+
+import string
+
+# Character classes of FILE_PATTERN:
+#   name: [a-zA-Z0-9_\-/*]    var: [a-zA-Z0-9_\-*]
+_VAR_CHARS = frozenset(string.ascii_letters + string.digits + "_-*")
+_NAME_CHARS = _VAR_CHARS | {"/"}
+# every character a wildcard token (or two adjacent ones) can be made of
+TOKEN_CHARS = _NAME_CHARS | {"^"}
+# name after a bracket chain '^': [A-Za-z0-9_\-]
+_CHAIN_VAR_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+
+def _run_end(s: str, start: int, chars: frozenset) -> int:
+    i = start
+    n = len(s)
+    while i < n and s[i] in chars:
+        i += 1
+    return i
+
+
+def _match_var_tail(s: str, q: int):
+    """
+    At s[q] == '^': greedily take var chars, backing off until '__' follows,
+    i.e. the last '__' inside the var run. Returns (var_end, match_end) or None.
+    """
+    run_end = _run_end(s, q + 1, _VAR_CHARS)
+    var_end = s.rfind("__", q + 2, run_end)
+    if var_end == -1:
+        return None
+    return var_end, var_end + 2
+
+
+def _match_at(s: str, p: int):
+    """
+    Try to match a wildcard token starting at p (where s[p:p+2] == '__').
+    Follows the regex backtracking order: shortest name first, then no name.
+    Returns (start, end, name, var) or None.
+    """
+    j = p + 2
+    # shortest name: the first '__' after at least one name char, provided
+    # everything before it is a name char ('^' can only end the name run)
+    q = s.find("__", j + 1)
+    if q != -1 and _NAME_CHARS.issuperset(s[j:q]):
+        return p, q + 2, s[j:q], None
+
+    e = _run_end(s, j, _NAME_CHARS)
+    if e < len(s) and s[e] == "^":
+        tail = _match_var_tail(s, e)
+        if tail:
+            return p, tail[1], (s[j:e] if e > j else None), s[e + 1:tail[0]]
+    if s.startswith("__", j):
+        return p, j + 2, None, None
+    return None
+
+
+def chain_var_end(s: str, start: int) -> int:
+    """
+    End of the bracket chain variable name starting at start (start itself if
+    there is none). Equivalent of re.match(r"[A-Za-z0-9_\-]+", s[start:]).
+    """
+    return _run_end(s, start, _CHAIN_VAR_CHARS)
+
+
+def token_run_start(s: str, p: int) -> int:
+    """
+    Start of the run of TOKEN_CHARS ending just before p (p itself if s[p-1] is
+    not a token char). No wildcard token can straddle the returned index.
+    """
+    while p > 0 and s[p - 1] in TOKEN_CHARS:
+        p -= 1
+    return p
+
+
+def find_wildcard(s: str, pos: int = 0):
+    """
+    Equivalent of FILE_PATTERN.search(s, pos).
+    Returns (start, end, name, var) where name/var may be None, or None if no token.
+    """
+    p = s.find("__", pos)
+    while p != -1:
+        m = _match_at(s, p)
+        if m:
+            return m
+        p = s.find("__", p + 1)
+    return None
+
+
+def adjacent_breaks(s: str, start: int = 0, end: int | None = None) -> list:
+    """
+    Equivalent of the split points of generator.ADJ_WC_PATTERN over s[start:end]:
+    the index between group 1 and group 2 of every match, in order.
+
+    A match lies inside one run of TOKEN_CHARS and swallows the run's last '__',
+    so each run holds at most one. The greedy first group ends at the last
+    '____' that leaves room for a second '__x__' before that final '__'.
+    """
+    if end is None:
+        end = len(s)
+    breaks = []
+    i = s.find("____", start, end)
+    while i != -1:
+        a = token_run_start(s, i)
+        if a < start:
+            a = start
+        r = _run_end(s, i, TOKEN_CHARS)
+        if r > end:
+            r = end
+        first = s.find("__", a, r)
+        last = s.rfind("__", a, r) + 2
+        k = s.rfind("____", first + 3, last - 3)
+        if k != -1:
+            breaks.append(k + 2)
+        i = s.find("____", r, end)
+    return breaks
+
+
+def comment_spans(s: str):
+    """
+    Yield (start, end, body_start, body_end) for every ##...## block, like
+    re.finditer(r"##(.*?)##", s, re.DOTALL).
+    """
+    i = s.find("##")
+    while i != -1:
+        j = s.find("##", i + 2)
+        if j == -1:
+            return
+        yield i, j + 2, i + 2, j
+        i = s.find("##", j + 2)
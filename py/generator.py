@@ -12,7 +12,15 @@ Changes:
 
 import re
 import os
+import stat
+import time
 import random
+import bisect
+import functools
+import itertools
+import math
+
+from ._wildcard_lex import adjacent_breaks, chain_var_end, find_wildcard, token_run_start
 
 
 BRACKET_PATTERN = re.compile(r"\{([^{}]+)\}")
@@ -35,6 +43,21 @@ DEFAULT_WILDCARD_ROOT = os.path.abspath(
 
 # -------------------------------- RNG ---------------------------------------
 
+# A SeededRandom stream seeds Random(base + k) for its k-th draw, so runs with
+# nearby base seeds (ComfyUI's "increment" mode) keep reseeding the same values.
+# The single draws random() / choice() / exceeds() take from such a Random are
+# pure functions of its seed, and are memoized here instead of rebuilt.
+_FIRST_DRAW_MAX = 8192
+
+@functools.lru_cache(maxsize=_FIRST_DRAW_MAX)
+def _first_random(seed: int) -> float:
+    return random.Random(seed).random()
+
+@functools.lru_cache(maxsize=_FIRST_DRAW_MAX)
+def _first_index(seed: int, n: int) -> int:
+    # same draw as Random(seed).choice(seq) for len(seq) == n
+    return random.Random(seed).randrange(n)
+
 class SeededRandom:
     def __init__(self, base_seed: int):
         self.seed = base_seed
@@ -46,9 +69,24 @@ class SeededRandom:
         self.seed += 1
         return random.Random(self.seed)
 
+    def skip(self):
+        """
+        Advances the seed exactly like next_rng(), without building the Random.
+        """
+        self.seed += 1
+
+    def derive(self) -> "SeededRandom":
+        """
+        Advances the seed and returns SeededRandom(next_rng().getrandbits(64)).
+        The sub-stream's base seed is only computed on first use: most choices
+        and separators are plain text that never draws from it.
+        """
+        self.seed += 1
+        return _DerivedSeededRandom(self.seed)
+
     def random(self) -> float:
-        rng = self.next_rng()
-        return rng.random()
+        self.seed += 1
+        return _first_random(self.seed)
 
     def uniform(self, a: float, b: float) -> float:
         rng = self.next_rng()
@@ -59,20 +97,62 @@ class SeededRandom:
         return rng.randint(a, b)
 
     def choice(self, seq):
-        rng = self.next_rng()
-        return rng.choice(seq)
+        # a one-item choice cannot depend on the stream: skip seeding it
+        if len(seq) == 1:
+            self.skip()
+            return seq[0]
+        if not seq:
+            return self.next_rng().choice(seq)
+        self.seed += 1
+        return seq[_first_index(self.seed, len(seq))]
+
+    def exceeds(self, threshold: float) -> bool:
+        """
+        next_rng().random() > threshold. random() is always below 1.0, so a
+        threshold of 1.0 or more only advances the seed.
+        """
+        if threshold >= 1.0:
+            self.skip()
+            return False
+        return self.random() > threshold
+
+class _DerivedSeededRandom(SeededRandom):
+    def __init__(self, parent_seed: int):
+        self._parent_seed = parent_seed
+        self._seed = None
+
+    @property
+    def seed(self) -> int:
+        if self._seed is None:
+            self._seed = random.Random(self._parent_seed).getrandbits(64)
+        return self._seed
+
+    @seed.setter
+    def seed(self, value: int):
+        self._seed = value
 
 # ------------------------- Quick taggers/helpers ----------------------------
 
+@functools.lru_cache(maxsize=4096)
 def is_file_wildcard(choice: str) -> bool:
     # allow caller to pass padded choices; check trimmed for pattern match
     return bool(FILE_PATTERN.fullmatch(choice.strip()))
 
 def _space_adjacent_wildcards(s: str) -> str:
-    if not s:
+    # two adjacent tokens always meet in a run of four underscores ("__a____b__")
+    if not s or "____" not in s:
+        return s
+    breaks = adjacent_breaks(s)
+    if not breaks:
         return s
     # Insert marker between the two matched wildcard tokens.
-    return ADJ_WC_PATTERN.sub(r"\1" + _ADJ_WC_MARKER + r"\2", s)
+    parts = []
+    last = 0
+    for b in breaks:
+        parts.append(s[last:b])
+        last = b
+    parts.append(s[last:])
+    return _ADJ_WC_MARKER.join(parts)
 
 # ---------------------- Wildcard blocking helpers -------------------------
 
@@ -85,7 +165,7 @@ def _protect_escaped_wildcards(text: str, mapping: dict) -> str:
     mapping is mutated: placeholder -> literal (without leading backslash).
     Returns new text.
     """
-    if not text:
+    if "\\" not in text:
         return text
     def _repl(m):
         literal = m.group(1)  # e.g., "__foo__" or "__foo^var__"
@@ -106,40 +186,26 @@ def _restore_escaped_wildcards(text: str, mapping: dict) -> str:
     return text
 # ---------------------- Top-level split helpers ------------------------------
 
+# Both helpers jump between the characters they care about with a compiled
+# scan instead of walking every character; '$$'/'??' pair up left to right.
+_SEPARATOR_SCAN_RE = re.compile(r"[{}]|\$\$|\?\?")
+_PIPE_SCAN_RE = re.compile(r"[{}|]")
+
 def _find_top_level_separators(s: str) -> list[tuple[int, str]]:
     """
     Returns a list of (index, token) where token is '$$' or '??'
     """
     results = []
     depth = 0
-    i = 0
-    L = len(s)
-
-    while i < L:
-        c = s[i]
-
-        if c == "{":
+    for m in _SEPARATOR_SCAN_RE.finditer(s):
+        tok = m.group()
+        if tok == "{":
             depth += 1
-            i += 1
-            continue
-        if c == "}":
+        elif tok == "}":
             if depth > 0:
                 depth -= 1
-            i += 1
-            continue
-
-        if depth == 0:
-            if s.startswith("$$", i):
-                results.append((i, "$$"))
-                i += 2
-                continue
-            if s.startswith("??", i):
-                results.append((i, "??"))
-                i += 2
-                continue
-
-        i += 1
-
+        elif depth == 0:
+            results.append((m.start(), tok))
     return results
 
 def _split_top_level_pipes(s: str) -> list[str]:
@@ -148,33 +214,32 @@ def _split_top_level_pipes(s: str) -> list[str]:
     IMPORTANT: do NOT trim returned segments — return exactly as found so leading/trailing
     spaces/newlines of each choice are preserved for correct spacing.
     """
+    if "{" not in s:
+        return s.split("|")
     parts = []
-    buf = []
     depth = 0
-    i = 0
-    L = len(s)
-    while i < L:
-        c = s[i]
-        if c == "{":
+    last = 0
+    for m in _PIPE_SCAN_RE.finditer(s):
+        tok = m.group()
+        if tok == "{":
             depth += 1
-            buf.append(c)
-        elif c == "}":
+        elif tok == "}":
             if depth > 0:
                 depth -= 1
-            buf.append(c)
-        elif c == "|" and depth == 0:
-            parts.append("".join(buf))
-            buf = []
-        else:
-            buf.append(c)
-        i += 1
-    parts.append("".join(buf))
+        elif depth == 0:
+            parts.append(s[last:m.start()])
+            last = m.end()
+    parts.append(s[last:])
     return parts
 
 # ------------------------ Weighted file helpers -----------------------------
 
 _WEIGHT_RE = re.compile(r'(?<!\\)%([0-9]*\.?[0-9]+)')
 
+# wildcard file lines: unescaped '#' starts an inline comment, %w% is a line weight
+_LINE_COMMENT_RE = re.compile(r'(?<!\\)#')
+_LINE_WEIGHT_RE = re.compile(r'(?<!\\)%([0-9]*\.?[0-9]+)%')
+
 def _extract_choice_weight(choice: str) -> tuple[str, float]:
     """
     Extract trailing %weight from a bracket choice.
@@ -200,10 +265,11 @@ def _parse_weighted_options(lines_iterable):
         line = raw.strip()
         if not line or line.startswith("#"):
             continue
-        line = re.split(r'(?<!\\)#', line)[0].strip()
-        if not line:
-            continue
-        m = re.search(r'(?<!\\)%([0-9]*\.?[0-9]+)%', line)
+        if "#" in line:
+            line = _LINE_COMMENT_RE.split(line, 1)[0].strip()
+            if not line:
+                continue
+        m = _LINE_WEIGHT_RE.search(line) if "%" in line else None
         if m:
             w = float(m.group(1))
             line = (line[:m.start()] + line[m.end():]).strip()
@@ -215,15 +281,74 @@ def _parse_weighted_options(lines_iterable):
             weights.append(w)
     return items, weights
 
-def _load_weighted_file(filepath: str):
+@functools.lru_cache(maxsize=2048)
+def _load_weighted_file_cached(filepath: str, mtime_ns: int):
     """
-    Read a wildcard file and return (items, weights).
+    Parse a wildcard file once per (path, mtime); edited files get a new key.
+    Returns immutable (items, weights, cum_weights, total) shared by every caller;
+    the running sums let single draws skip re-accumulating the weights.
     """
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            return _parse_weighted_options(f)
+            items, weights = _parse_weighted_options(f)
     except OSError:
-        return [], []
+        return (), (), (), 0
+    return _weighted_table(items, weights)
+
+def _weighted_table(items, weights):
+    """
+    (items, weights, cum_weights, total) as immutable tuples, ready for _table_draw.
+    """
+    return tuple(items), tuple(weights), tuple(itertools.accumulate(weights)), sum(weights)
+
+@functools.lru_cache(maxsize=512)
+def _parse_options_cached(options: tuple):
+    return _weighted_table(*_parse_weighted_options(options))
+
+def _table_draw(table, rng: random.Random) -> str:
+    """
+    One weighted draw from a _weighted_table; same RNG use as _weighted_index.
+    """
+    items, _, cum_weights, total = table
+    if not items:
+        return ""
+    if total <= 0:
+        return items[rng.randrange(len(items))]
+    return items[_weighted_pick(cum_weights, rng.random() * total)]
+
+_file_mtimes = {}  # filepath -> (checked_at, mtime_ns), re-stat'ed after _FS_TTL
+
+def _load_weighted_table(filepath: str):
+    """
+    Cached (items, weights, cum_weights, total) for filepath; empty if unreadable.
+    """
+    now = time.monotonic()
+    hit = _file_mtimes.get(filepath)
+    if hit is not None and now - hit[0] < _FS_TTL:
+        return _load_weighted_file_cached(filepath, hit[1])
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
+        _file_mtimes.pop(filepath, None)
+        return (), (), (), 0
+    _file_mtimes[filepath] = (now, mtime_ns)
+    return _load_weighted_file_cached(filepath, mtime_ns)
+
+def _load_weighted_file(filepath: str):
+    """
+    Read a wildcard file and return (items, weights).
+    """
+    items, weights, _, _ = _load_weighted_table(filepath)
+    return items, weights
+
+def _weighted_pick(cum_weights, r: float) -> int:
+    """
+    Return the first index whose cumulative weight is >= r (clamped to the last index).
+    Numeric only: binary search over the running sums, no per-item Python loop.
+    """
+    idx = bisect.bisect_left(cum_weights, r)
+    last = len(cum_weights) - 1
+    return idx if idx < last else last
 
 def _weighted_index(weights, rng: random.Random) -> int:
     """
@@ -235,12 +360,18 @@ def _weighted_index(weights, rng: random.Random) -> int:
     if total <= 0:
         return rng.randrange(len(weights))
     r = rng.random() * total
-    acc = 0.0
-    for i, w in enumerate(weights):
-        acc += w
-        if r <= acc:
-            return i
-    return len(weights) - 1
+    return _weighted_pick(list(itertools.accumulate(weights)), r)
+
+def _unit_weight_index(n: int, rng: random.Random) -> int:
+    """
+    _weighted_index for n weights that are all 1.0 (the common unweighted case):
+    the running sums are 1, 2, ..., n, so the bisect reduces to ceil(r) - 1.
+    Same RNG use and result, without summing or accumulating the weights.
+    """
+    idx = math.ceil(rng.random() * n) - 1
+    if idx < 0:
+        return 0
+    return idx if idx < n - 1 else n - 1
 
 # -------------------------- Bracket deck context ----------------------------
 
@@ -255,10 +386,13 @@ def _ensure_deck_for_file(ctx: dict, filepath: str):
         return decks[filepath]
     items, weights = _load_weighted_file(filepath)
     deck = {
-        "all_items": list(items),
-        "all_weights": list(weights),
+        # the cached file tuples are immutable, so the refill copies share them
+        "all_items": items,
+        "all_weights": weights,
         "remain_items": list(items),
         "remain_weights": list(weights),
+        # unweighted files can draw without re-accumulating the weights
+        "unit": all(w == 1.0 for w in weights),
     }
     decks[filepath] = deck
     return deck
@@ -278,7 +412,10 @@ def _deck_draw(deck: dict, rng: random.Random, allow_overflow: bool) -> str | No
             return None
     if not deck["remain_items"]:
         return None
-    idx = _weighted_index(deck["remain_weights"], rng)
+    if deck.get("unit"):
+        idx = _unit_weight_index(len(deck["remain_items"]), rng)
+    else:
+        idx = _weighted_index(deck["remain_weights"], rng)
     item = deck["remain_items"].pop(idx)
     deck["remain_weights"].pop(idx)
     return item
@@ -286,31 +423,155 @@ def _deck_draw(deck: dict, rng: random.Random, allow_overflow: bool) -> str | No
 # ---------------------- File I/O / wildcard selection -----------------------
 
 def _read_weighted_line(filepath: str, rng: random.Random) -> str:
-    items, weights = _load_weighted_file(filepath)
-    if not items:
-        return ""
-    idx = _weighted_index(weights, rng)
-    return items[idx]
-
-def _choose_file_from_dir(dir_path: str,
-                          rng: random.Random,
-                          prefix: str | None = None) -> str | None:
-    if not os.path.isdir(dir_path):
+    return _table_draw(_load_weighted_table(filepath), rng)
+
+# Filesystem caches. Wildcards are looked up on every resolver pass and for every
+# bracket choice naming them, so directory listings, file mtimes and misses are
+# trusted for _FS_TTL seconds (the Prompt Generator's folder-mtime window) before
+# being checked against the disk again.
+_FS_TTL = 5.0
+_MISSING_MAX = 4096
+_missing_paths = {}  # path -> time.monotonic() when it was found missing
+
+def _known_missing(path: str) -> bool:
+    seen = _missing_paths.get(path)
+    if seen is None:
+        return False
+    if time.monotonic() - seen < _FS_TTL:
+        return True
+    del _missing_paths[path]
+    return False
+
+def _mark_missing(path: str):
+    if len(_missing_paths) >= _MISSING_MAX:
+        _missing_paths.clear()
+    _missing_paths[path] = time.monotonic()
+
+def _path_exists(path: str) -> bool:
+    """
+    os.path.exists answered from the cached parent listing when possible,
+    with misses cached for _FS_TTL seconds.
+    """
+    parent, name = os.path.split(path)
+    entry = _dir_listing(parent)
+    if entry is not None and name in entry[3]:
+        return True
+    # not listed (or a case-insensitive filesystem): ask the disk
+    if _known_missing(path):
+        return False
+    if os.path.exists(path):
+        return True
+    _mark_missing(path)
+    return False
+
+# dir_path -> [checked_at, mtime_ns, txt filenames in listdir order,
+#              frozenset of all entry names, {prefix: candidate paths}]
+# A directory's mtime changes whenever an entry is added, removed or renamed.
+_DIR_CACHE = {}
+
+def _dir_listing(dir_path: str):
+    """
+    Cached listing entry for dir_path (see _DIR_CACHE), or None if it is not a
+    directory. The directory is re-stat'ed at most once per _FS_TTL seconds and
+    only re-listed when its mtime changed.
+    """
+    now = time.monotonic()
+    entry = _DIR_CACHE.get(dir_path)
+    if entry is not None and now - entry[0] < _FS_TTL:
+        return entry
+    if _known_missing(dir_path):
         return None
-    candidates = []
     try:
-        for f in os.listdir(dir_path):
-            if not f.lower().endswith(".txt"):
-                continue
-            name_no_ext = f[:-4]
-            if prefix is None or name_no_ext.startswith(prefix):
-                candidates.append(os.path.join(dir_path, f))
+        st = os.stat(dir_path)
     except OSError:
+        _DIR_CACHE.pop(dir_path, None)
+        _mark_missing(dir_path)
+        return None
+    if not stat.S_ISDIR(st.st_mode):
         return None
+    if entry is None or entry[1] != st.st_mtime_ns:
+        try:
+            all_names = os.listdir(dir_path)
+        except OSError:
+            return None
+        names = tuple(f for f in all_names if f.lower().endswith(".txt"))
+        entry = [now, st.st_mtime_ns, names, frozenset(all_names), {}]
+        _DIR_CACHE[dir_path] = entry
+    else:
+        entry[0] = now
+    return entry
+
+def _dir_candidates(dir_path: str, prefix: str | None) -> tuple:
+    """
+    Paths of the .txt files in dir_path (optionally whose name starts with prefix),
+    in os.listdir order so seeded picks stay stable. Empty if dir_path is not a directory.
+    """
+    entry = _dir_listing(dir_path)
+    if entry is None:
+        return ()
+    by_prefix = entry[4]
+    candidates = by_prefix.get(prefix)
+    if candidates is None:
+        candidates = tuple(
+            os.path.join(dir_path, f) for f in entry[2]
+            if prefix is None or f[:-4].startswith(prefix)
+        )
+        by_prefix[prefix] = candidates
+    return candidates
+
+def _choose_file_from_dir(dir_path: str,
+                          rng: random.Random,
+                          prefix: str | None = None) -> str | None:
+    candidates = _dir_candidates(dir_path, prefix)
     if not candidates:
         return None
     return rng.choice(candidates)
 
+@functools.lru_cache(maxsize=4096)
+def _fallback_path(path: str, primary_dir: str) -> str | None:
+    """
+    path re-rooted from primary_dir onto DEFAULT_WILDCARD_ROOT, or None.
+    path is always built by joining onto primary_dir, so relpath never depends
+    on the working directory and the result can be cached.
+    """
+    try:
+        rel = os.path.relpath(path, primary_dir)
+    except Exception:
+        rel = os.path.basename(path) if path else ""
+    return os.path.join(DEFAULT_WILDCARD_ROOT, rel) if rel else None
+
+_RESOLVED_MAX = 4096
+# (primary_dir, name) -> (checked_at, resolved filepath or None) for plain
+# __name__ / __dir/name__ lookups, trusted for _FS_TTL seconds like the listings
+_resolved_files = {}
+
+def _resolve_named_file(name: str, primary_dir: str) -> str | None:
+    """
+    Filepath a non-glob wildcard name resolves to (primary, then fallback root),
+    or None. Repeated tokens skip the path joins and existence checks.
+    """
+    key = (primary_dir, name)
+    now = time.monotonic()
+    hit = _resolved_files.get(key)
+    if hit is not None and now - hit[0] < _FS_TTL:
+        return hit[1]
+    if "/" in name:
+        dir_part, last = name.rsplit("/", 1)
+        filepath = os.path.join(os.path.join(primary_dir, dir_part), f"{last}.txt")
+    else:
+        filepath = os.path.join(primary_dir, f"{name}.txt")
+    resolved = None
+    if _path_exists(filepath):
+        resolved = filepath
+    else:
+        fallback_fp = _fallback_path(filepath, primary_dir)
+        if fallback_fp and _path_exists(fallback_fp):
+            resolved = fallback_fp
+    if len(_resolved_files) >= _RESOLVED_MAX:
+        _resolved_files.clear()
+    _resolved_files[key] = (now, resolved)
+    return resolved
+
 def process_file_wildcard(name: str,
                           rng: random.Random,
                           wildcard_dir: str,
@@ -334,22 +595,19 @@ def process_file_wildcard(name: str,
     # otherwise compute the fallback filepath and use that if it exists.
     def _resolve_filepath(candidate_fp: str) -> str | None:
         # If candidate exists, use it
-        if candidate_fp and os.path.exists(candidate_fp):
+        if candidate_fp and _path_exists(candidate_fp):
             return candidate_fp
         # Try to compute a fallback path by converting from primary_dir -> DEFAULT_WILDCARD_ROOT
-        try:
-            rel = os.path.relpath(candidate_fp, primary_dir)
-        except Exception:
-            rel = os.path.basename(candidate_fp) if candidate_fp else ""
-        if rel:
-            fallback_fp = os.path.join(DEFAULT_WILDCARD_ROOT, rel)
-            if os.path.exists(fallback_fp):
-                return fallback_fp
+        fallback_fp = _fallback_path(candidate_fp, primary_dir)
+        if fallback_fp and _path_exists(fallback_fp):
+            return fallback_fp
         return None
 
     def draw_from_filepath(filepath: str) -> str:
         # resolve actual filepath (primary -> fallback)
-        actual_fp = _resolve_filepath(filepath)
+        return draw_resolved(_resolve_filepath(filepath))
+
+    def draw_resolved(actual_fp: str | None) -> str:
         if not actual_fp:
             return ""
         # If no bracket context, do legacy single weighted draw
@@ -372,17 +630,12 @@ def process_file_wildcard(name: str,
             chosen = _choose_file_from_dir(dir_path, rng, prefix=prefix)
             if not chosen:
                 # try fallback directory
-                try:
-                    rel_dir = os.path.relpath(dir_path, primary_dir)
-                except Exception:
-                    rel_dir = os.path.basename(dir_path)
-                fallback_dir = os.path.join(DEFAULT_WILDCARD_ROOT, rel_dir)
-                chosen = _choose_file_from_dir(fallback_dir, rng, prefix=prefix)
+                fallback_dir = _fallback_path(dir_path, primary_dir)
+                chosen = _choose_file_from_dir(fallback_dir, rng, prefix=prefix) if fallback_dir else None
             return draw_from_filepath(chosen) if chosen else ""
 
-        filepath = os.path.join(dir_path, f"{last}.txt")
         # try primary then fallback
-        return draw_from_filepath(filepath)
+        return draw_resolved(_resolve_named_file(name, primary_dir))
 
     # Root-level cases
     if name == "*":
@@ -401,15 +654,11 @@ def process_file_wildcard(name: str,
         return draw_from_filepath(chosen) if chosen else ""
 
     # Specific file in primary dir -> fallback to default if missing
-    filepath = os.path.join(primary_dir, f"{name}.txt")
-    return draw_from_filepath(filepath)
+    return draw_resolved(_resolve_named_file(name, primary_dir))
 
 def weighted_choice(options: list[str], rng: random.Random) -> str:
-    items, weights = _parse_weighted_options(options)
-    if not items:
-        return ""
-    idx = _weighted_index(weights, rng)
-    return items[idx]
+    # option lists are parsed once; repeated calls only draw
+    return _table_draw(_parse_options_cached(tuple(options)), rng)
 
 # ---------------------- Variable helpers ------------------------------------
 
@@ -429,33 +678,18 @@ def _collect_candidates(_resolved_vars: dict,
     """
     if not _resolved_vars or not var_pat:
         return []
-    match_all = (var_pat == "*")
-    prefix = ""
-    exact_name = None
-    if match_all:
-        pass
+    # pick the matching buckets first, then flatten them in one comprehension
+    if var_pat == "*":
+        buckets = _resolved_vars.values()
     elif var_pat.endswith("*"):
         prefix = var_pat[:-1]
+        buckets = [bucket for vname, bucket in _resolved_vars.items() if vname.startswith(prefix)]
     else:
-        exact_name = var_pat
-    candidates = []
-    def add_values_for_var(vname: str):
-        bucket = _resolved_vars.get(vname, {})
-        if origin_filter is None:
-            candidates.extend(bucket.values())
-        else:
-            if origin_filter in bucket:
-                candidates.append(bucket[origin_filter])
-    if match_all:
-        for vname in _resolved_vars.keys():
-            add_values_for_var(vname)
-    elif exact_name is not None:
-        add_values_for_var(exact_name)
-    else:
-        for vname in _resolved_vars.keys():
-            if vname.startswith(prefix):
-                add_values_for_var(vname)
-    return candidates
+        bucket = _resolved_vars.get(var_pat)
+        buckets = (bucket,) if bucket else ()
+    if origin_filter is None:
+        return [value for bucket in buckets for value in bucket.values()]
+    return [bucket[origin_filter] for bucket in buckets if origin_filter in bucket]
 
 # ---------------------- Select Bracket to process -----------------------
 
@@ -465,44 +699,129 @@ def find_next_bracket_span(text: str):
     Preference logic:
       - If any span has top-level $$ markers and contains nested spans inside its separator region,
         prefer that span (this prevents nested separators from being pre-resolved).
-      - Otherwise, return the innermost span (max depth), earliest by start.
+      - Otherwise, return the outermost span, earliest by start.
     Returns tuple (start_index, end_index) or None.
+
+    One scan over the brace/separator tokens: each open span records the first
+    two separators at its own top level, so no span content is re-scanned.
     """
-    stack = []
-    spans = []
-    for i, ch in enumerate(text):
-        if ch == "{":
-            stack.append(i)
-        elif ch == "}":
-            if stack:
-                s = stack.pop()
-                depth = len(stack) + 1
-                spans.append((s, i, depth))
-    if not spans:
-        return None
-    candidates = []
-    for s, e, depth in spans:
-        content = text[s+1:e]
-        separators  = _find_top_level_separators(content)
-        if len(separators ) >= 2:
-            idx1, _ = separators[0]
-            idx2, _ = separators[1]
-            for ns, ne, nd in spans:
-                if ns > s and ne < e:
-                    nested_local_start = ns - (s + 1)
-                    if nested_local_start >= idx1 + 2 and nested_local_start < idx2:
-                        candidates.append((s, e, depth))
-                        break
-    if candidates:
-        candidates.sort(key=lambda x: x[0])
-        return (candidates[0][0], candidates[0][1])
-    max_depth = max(sp[2] for sp in spans)
-    outers = [sp for sp in spans if sp[2] == 1]
-    outers.sort(key=lambda x: x[0])
-    return (outers[0][0], outers[0][1])
+    stack = []          # [(start, [first two top-level separator indices])]
+    candidate = None    # earliest-starting span preferred by the $$ rule
+    outer = None        # (depth, start, end) of the shallowest, earliest span
+    for m in _SEPARATOR_SCAN_RE.finditer(text):
+        tok = m.group()
+        if tok == "{":
+            stack.append((m.start(), []))
+        elif tok == "}":
+            if not stack:
+                continue
+            start, seps = stack.pop()
+            end = m.start()
+            if len(seps) == 2 and text.find("{", seps[0] + 2, seps[1]) != -1:
+                # a nested span starts inside the separator region
+                if candidate is None or start < candidate[0]:
+                    candidate = (start, end)
+            depth = len(stack) + 1
+            if outer is None or (depth, start) < outer[:2]:
+                outer = (depth, start, end)
+        elif stack:
+            seps = stack[-1][1]
+            if len(seps) < 2:
+                seps.append(m.start())
+    if candidate:
+        return candidate
+    if outer:
+        return outer[1], outer[2]
+    return None
 
 # ---------------------- Bracket processing ----------------------------------
 
+# top-level structure of a bracket body: braces, choice pipes and $$/?? markers
+_BRACKET_PARTS_RE = re.compile(r"[{}|]|\$\$|\?\?")
+
+@functools.lru_cache(maxsize=2048)
+def _split_bracket(content: str):
+    """
+    One scan over a bracket body, equivalent to _find_top_level_separators on the
+    body followed by _split_top_level_pipes on its choices part.
+    Returns (token, count_part, separator, raw_choices); count_part is None when
+    the body has no $$/?? header. Cached: the same brackets recur on every pass.
+    """
+    depth = 0
+    seps = []
+    pipes = []
+    for m in _BRACKET_PARTS_RE.finditer(content):
+        tok = m.group()
+        if tok == "{":
+            depth += 1
+        elif tok == "}":
+            if depth > 0:
+                depth -= 1
+        elif depth == 0:
+            (pipes if tok == "|" else seps).append(m.start())
+
+    token = "$$"
+    count_part = None
+    separator = ", "
+    start = 0
+    if seps:
+        token = content[seps[0]:seps[0] + 2]
+        count_part = content[:seps[0]]
+        if len(seps) == 1:
+            start = seps[0] + 2
+        else:
+            raw_separator = content[seps[0] + 2:seps[1]]
+            start = seps[1] + 2
+            try:
+                separator = raw_separator.encode("utf-8").decode("unicode_escape")
+            except Exception:
+                separator = raw_separator
+
+    raw_choices = []
+    last = start
+    for p in pipes:
+        if p >= start:
+            raw_choices.append(content[last:p])
+            last = p + 1
+    raw_choices.append(content[last:])
+    return token, count_part, separator, tuple(raw_choices)
+
+@functools.lru_cache(maxsize=4096)
+def _classify_choice(choice: str):
+    """
+    Split one raw bracket choice into (key, weight), where key is
+    (kind, canonical, original, var_tok) and kind is "var", "file" or "lit".
+    Cached: the same choices come back on every pass and in every repeated bracket.
+    """
+    clean, w = _extract_choice_weight(choice)
+    trimmed = clean.strip()
+    m = FILE_PATTERN.fullmatch(trimmed)
+
+    if m:
+        wc_name = m.group(1)
+        var_tok = m.group(2)
+        if wc_name is None and var_tok:
+            return ("var", var_tok, clean, var_tok), w
+        return ("file", wc_name.strip() if wc_name else "", clean, var_tok), w
+    return ("lit", trimmed, clean, None), w
+
+@functools.lru_cache(maxsize=2048)
+def _bracket_choices(raw_choices: tuple):
+    """
+    (choice keys, per-key weights, all weights 1.0, roulette table) for a bracket's
+    raw choices, classified in one pass. Identical choices share the weight of
+    their first occurrence. Cached like _split_bracket, whose output it consumes.
+    """
+    choice_keys = []
+    key_weights = {}
+    for c in raw_choices:
+        key, w = _classify_choice(c)
+        choice_keys.append(key)
+        key_weights.setdefault(key, w)
+    keys = tuple(choice_keys)
+    weights = tuple(key_weights[k] for k in keys)
+    return keys, weights, all(w == 1.0 for w in weights), _weighted_table(keys, weights)
+
 def process_bracket(content: str,
                     seeded_rng: SeededRandom,
                     wildcard_dir: str,
@@ -519,8 +838,6 @@ def process_bracket(content: str,
     """
     count = 1
     exhaust_all = False
-    separator = ", "
-    choices_str = content
 
     if bracket_ctx is None:
         bracket_ctx = {"allow_overflow": bool(bracket_overflow), "decks": {}}
@@ -528,26 +845,9 @@ def process_bracket(content: str,
         bracket_ctx.setdefault("allow_overflow", bool(bracket_overflow))
         bracket_ctx.setdefault("decks", {})
 
-    separators = _find_top_level_separators(content)
-    token = "$$"
-
-    if separators:
-        if len(separators) == 1:
-            idx, token = separators[0]
-            count_part = content[:idx]
-            choices_str = content[idx + 2:]
-        else:
-            idx1, token = separators[0]
-            idx2, _ = separators[1]
-            count_part = content[:idx1]
-            raw_separator = content[idx1 + 2:idx2]
-            choices_str = content[idx2 + 2:]
-
-            try:
-                separator = raw_separator.encode("utf-8").decode("unicode_escape")
-            except Exception:
-                separator = raw_separator
+    token, count_part, separator, raw_choices = _split_bracket(content)
 
+    if count_part is not None:
         if count_part.strip() == "*":
             exhaust_all = True
         elif "-" in count_part:
@@ -561,32 +861,8 @@ def process_bracket(content: str,
 
     selection_mode = "roulette" if token == "??" else "deck"
 
-    raw_choices = _split_top_level_pipes(choices_str)
-
-    choice_keys = []
-    weights = []
-
-    for c in raw_choices:
-        clean, w = _extract_choice_weight(c)
-        weights.append(w)
-
-        trimmed = clean.strip()
-        m = FILE_PATTERN.fullmatch(trimmed)
-
-        if m:
-            wc_name = m.group(1)
-            var_tok = m.group(2)
-            if wc_name is None and var_tok:
-                key = ("var", var_tok, clean, var_tok)
-            else:
-                key = ("file", wc_name.strip() if wc_name else "", clean, var_tok)
-        else:
-            key = ("lit", trimmed, clean, None)
-
-        choice_keys.append(key)
-
-    # Remove deduplication entirely
-    unique_keys = choice_keys.copy()
+    # no deduplication: every choice stays in the pool
+    unique_keys, key_weight_list, unit, table = _bracket_choices(raw_choices)
 
     # --- Handle * (exhaust all) mode ---
     if exhaust_all:
@@ -600,8 +876,7 @@ def process_bracket(content: str,
                 vals = _collect_candidates(_resolved_vars, canonical, origin_filter=None)
                 results.extend(vals)
             else:
-                eval_seed = seeded_rng.next_rng().getrandbits(64)
-                eval_rng = SeededRandom(eval_seed)
+                eval_rng = seeded_rng.derive()
                 resolved = resolve_wildcards(
                     original, eval_rng, wildcard_dir,
                     _resolved_vars=_resolved_vars,
@@ -613,35 +888,17 @@ def process_bracket(content: str,
 
         # Join with separator
         if results:
-            joined = results[0]
-            for item in results[1:]:
-                sep_seed = seeded_rng.next_rng().getrandbits(64)
-                sep_rng = SeededRandom(sep_seed)
-                sep_resolved = resolve_wildcards(
-                    separator, sep_rng, wildcard_dir,
-                    _resolved_vars=_resolved_vars,
-                    bracket_ctx=bracket_ctx,
-                    bracket_overflow=bracket_ctx["allow_overflow"]
-                )
-                joined += sep_resolved + item
-            return joined
+            return _join_bracket_results(results, separator, seeded_rng, wildcard_dir,
+                                         _resolved_vars, bracket_ctx)
         else:
             return ""
 
     rng = seeded_rng.next_rng()
 
-    def weighted_pick(pool):
-        idx = _weighted_index(
-            [weights[choice_keys.index(k)] for k in pool],
-            rng
-        )
-        return pool[idx]
-
     def resolve_choice(key):
         kind, canonical, original, var_tok = key
 
-        eval_seed = seeded_rng.next_rng().getrandbits(64)
-        eval_rng = SeededRandom(eval_seed)
+        eval_rng = seeded_rng.derive()
 
         if kind == "lit":
             return resolve_wildcards(
@@ -659,7 +916,7 @@ def process_bracket(content: str,
         if not drawn:
             return ""
 
-        resolved = resolve_wildcards(
+        resolved = drawn if not _needs_resolution(drawn) else resolve_wildcards(
             drawn, eval_rng, wildcard_dir,
             _resolved_vars=_resolved_vars,
             bracket_ctx=bracket_ctx,
@@ -673,43 +930,72 @@ def process_bracket(content: str,
         return resolved
 
     results = []
-    deck = list(unique_keys)
 
-    while len(results) < count:
-        if selection_mode == "deck":
+    if selection_mode == "roulette":
+        # the pool never shrinks: one cumulative table serves every draw
+        while len(results) < count:
+            results.append(resolve_choice(_table_draw(table, rng)))
+    else:
+        deck = list(unique_keys)
+        deck_weights = list(key_weight_list)
+        while len(results) < count:
             if not deck:
                 if not bracket_ctx["allow_overflow"]:
                     break
                 deck = list(unique_keys)
+                deck_weights = list(key_weight_list)
 
-            key = weighted_pick(deck)
-            deck.remove(key)
-        else:
-            key = weighted_pick(unique_keys)
-
-        results.append(resolve_choice(key))
+            i = _unit_weight_index(len(deck), rng) if unit else _weighted_index(deck_weights, rng)
+            deck_weights.pop(i)
+            results.append(resolve_choice(deck.pop(i)))
 
     if not results:
         return ""
 
-    joined = results[0]
+    return _join_bracket_results(results, separator, seeded_rng, wildcard_dir,
+                                 _resolved_vars, bracket_ctx)
+
+def _join_bracket_results(results: list,
+                          separator: str,
+                          seeded_rng: SeededRandom,
+                          wildcard_dir: str,
+                          _resolved_vars,
+                          bracket_ctx: dict) -> str:
+    """
+    Join bracket results, resolving the separator afresh between each pair.
+    Each separator takes one derived sub-stream; a plain separator resolves to
+    itself, so its sub-streams are only counted and the results joined at once.
+    """
+    if not _needs_resolution(separator):
+        if len(results) > 1:
+            seeded_rng.seed += len(results) - 1
+        return separator.join(results)
+    parts = [results[0]]
     for item in results[1:]:
-        sep_seed = seeded_rng.next_rng().getrandbits(64)
-        sep_rng = SeededRandom(sep_seed)
-        sep_resolved = resolve_wildcards(
-            separator, sep_rng, wildcard_dir,
+        parts.append(resolve_wildcards(
+            separator, seeded_rng.derive(), wildcard_dir,
             _resolved_vars=_resolved_vars,
             bracket_ctx=bracket_ctx,
             bracket_overflow=bracket_ctx["allow_overflow"]
-        )
-        joined += sep_resolved + item
-
-    return joined
+        ))
+        parts.append(item)
+    return "".join(parts)
 
 
 # ---------------------- Main resolver (iterative passes + final sweep) ------------
 
-_VARNAME_RE = re.compile(r"[A-Za-z0-9_\-]+")
+def _needs_resolution(s: str) -> bool:
+    """
+    False when resolve_wildcards(s) would return s unchanged: no bracket, no
+    wildcard token and no adjacency marker. Most wildcard file lines are plain.
+    """
+    return "{" in s or "__" in s or _ADJ_WC_MARKER in s
+
+def _is_fresh_draw(generated: str | None, full_token: str) -> bool:
+    """
+    True when a file draw produced something other than the token itself.
+    """
+    return bool(generated) and generated != full_token and generated.strip() != full_token.strip()
 
 def _final_sweep_resolve(text: str,
                          seeded_rng: SeededRandom,
@@ -721,36 +1007,41 @@ def _final_sweep_resolve(text: str,
     Final left-to-right pass that tries to resolve any remaining variable/wildcard tokens.
     This is executed once after the iterative passes to rescue __^var__ style tokens that
     could not be resolved earlier.
+
+    Replacements are never rescanned, so the result is built from segments in a
+    single left-to-right walk over the input.
     """
+    parts = []
     i = 0
     while True:
-        m = FILE_PATTERN.search(text, i)
+        m = find_wildcard(text, i)
         if not m:
             break
-        full_token = m.group(0)
-        wc_name = m.group(1)
-        var_tok = m.group(2)
+        m_start, m_end, wc_name, var_tok = m
+        full_token = text[m_start:m_end]
 
         replacement = None
 
         if wc_name is None and var_tok:
             candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=None)
             if candidates:
-                replacement = seeded_rng.next_rng().choice(candidates)
+                replacement = seeded_rng.choice(candidates)
             else:
                 # fallback: try to resolve a wildcard file named var_tok (i.e., __^var__ (if no variable resolved, then -> __var__))
                 rng_for_this = seeded_rng.next_rng()
                 generated = process_file_wildcard(var_tok, rng_for_this, wildcard_dir, bracket_ctx=None)
-                if generated and (generated == full_token or generated.strip() == full_token.strip()) is False:
-                    replacement = resolve_wildcards(generated, seeded_rng, wildcard_dir,
-                                                   _depth=_depth + 1, _resolved_vars=_resolved_vars)
+                if _is_fresh_draw(generated, full_token):
+                    replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
+                        generated, seeded_rng, wildcard_dir,
+                        _depth=_depth + 1, _resolved_vars=_resolved_vars
+                    )
                 else:
                     replacement = ""
         elif wc_name is not None and var_tok:
             if "*" in var_tok:
                 candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=wc_name)
                 if candidates:
-                    replacement = seeded_rng.next_rng().choice(candidates)
+                    replacement = seeded_rng.choice(candidates)
                 else:
                     replacement = ""
             else:
@@ -760,8 +1051,8 @@ def _final_sweep_resolve(text: str,
                 else:
                     rng_for_this = seeded_rng.next_rng()
                     generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=None)
-                    if generated and (generated == full_token or generated.strip() == full_token.strip()) is False:
-                        replacement = resolve_wildcards(
+                    if _is_fresh_draw(generated, full_token):
+                        replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
                             generated, seeded_rng, wildcard_dir,
                             _depth=_depth + 1, _resolved_vars=_resolved_vars
                         )
@@ -774,18 +1065,37 @@ def _final_sweep_resolve(text: str,
         else:
             rng_for_this = seeded_rng.next_rng()
             generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=None)
-            if generated and (generated == full_token or generated.strip() == full_token.strip()) is False:
-                replacement = resolve_wildcards(
+            if _is_fresh_draw(generated, full_token):
+                replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
                     generated, seeded_rng, wildcard_dir,
                     _depth=_depth + 1, _resolved_vars=_resolved_vars
                 )
             else:
                 replacement = ""
 
-        text = text[:m.start()] + replacement + text[m.end():]
-        i = m.start() + len(replacement)
+        parts.append(text[i:m_start])
+        parts.append(replacement)
+        i = m_end
 
-    return text
+    if not parts:
+        return text
+    parts.append(text[i:])
+    return "".join(parts)
+
+def _stable_prefix_len(text: str, pos: int) -> int:
+    """
+    Length of the prefix of text (before the next token/bracket at pos) that a
+    resolver pass can never rewrite again: it must end outside any run of token
+    characters, hold no '{' that a later '}' could still close, and already be
+    adjacent-wildcard spaced. Returns 0 when no such prefix exists.
+    """
+    cut = token_run_start(text, pos)
+    brace = text.find("{", 0, cut)
+    if brace != -1:
+        cut = token_run_start(text, brace)
+    if cut and adjacent_breaks(text, 0, cut):
+        return 0
+    return cut
 
 def resolve_wildcards(text: str,
                       seeded_rng: SeededRandom,
@@ -804,7 +1114,7 @@ def resolve_wildcards(text: str,
       - After the normal iterative passes, runs a final sweep attempting to resolve
         any remaining variable/wildcard tokens once more; removes ones that cannot be resolved.
     """
-    if _depth > 80:
+    if _depth > 80 or not _needs_resolution(text):
         return text
 
     if _resolved_vars is None:
@@ -826,186 +1136,205 @@ def resolve_wildcards(text: str,
         placeholder_counter += 1
         return ph
 
-    max_passes = 12
-    pass_no = 0
-    while pass_no < max_passes:
-        pass_no += 1
-        changed = False
-
-        def _single_pass(s_text: str) -> str:
-            nonlocal changed, placeholders
-            working = s_text
-
-            while True:
-                m_file = FILE_PATTERN.search(working)
+    changed = False
+
+    # defined once per call; each pass only resets the state it reads
+    def _single_pass(s_text: str) -> str:
+        nonlocal changed, placeholders
+        # Text that no later step of this pass can touch is moved into 'done',
+        # so scans and splices only work on the unresolved tail.
+        done = []
+        working = s_text
+
+        while True:
+            m_file = find_wildcard(working)
+            if (m_file and working.find("{", 0, m_file[0]) == -1
+                    and "$$" not in working and "??" not in working):
+                # no span starts before the token and none can be preferred
+                # over it ($$ preference needs separators): skip the bracket scan
+                br_span = None
+            else:
                 br_span = find_next_bracket_span(working)
-                if br_span:
-                    br_start, br_end = br_span
-                else:
-                    br_start = br_end = None
+            if br_span:
+                br_start, br_end = br_span
+            else:
+                br_start = br_end = None
 
-                if not m_file and not br_span:
-                    break
+            if not m_file and not br_span:
+                break
 
-                if m_file and br_span:
-                    take_bracket = (br_start < m_file.start())
-                else:
-                    take_bracket = bool(br_span)
-
-                if take_bracket:
-                    content = working[br_start + 1: br_end]
-                    repl = process_bracket(
-                        content,
-                        seeded_rng,
-                        wildcard_dir,
-                        _resolved_vars=_resolved_vars,
-                        bracket_ctx=bracket_ctx,
-                        bracket_overflow=bracket_overflow
-                    )
+            if m_file and br_span:
+                take_bracket = (br_start < m_file[0])
+            else:
+                take_bracket = bool(br_span)
+
+            # the stable prefix is dropped by the splice below rather than by a
+            # slice of its own, so each step copies the tail only once
+            cut = _stable_prefix_len(working, br_start if take_bracket else m_file[0])
+            if cut:
+                done.append(working[:cut])
+
+            if take_bracket:
+                content = working[br_start + 1: br_end]
+                repl = process_bracket(
+                    content,
+                    seeded_rng,
+                    wildcard_dir,
+                    _resolved_vars=_resolved_vars,
+                    bracket_ctx=bracket_ctx,
+                    bracket_overflow=bracket_overflow
+                )
 
-                    chain_assigned_values = []
-                    replace_end = br_end + 1
-                    pos = br_end + 1
-                    made_assignment = False
+                chain_assigned_values = []
+                replace_end = br_end + 1
+                pos = br_end + 1
+                made_assignment = False
 
-                    while pos < len(working) and working[pos] == "^":
-                        m_var = _VARNAME_RE.match(working, pos + 1)
-                        if not m_var:
-                            break
-                        var_name = m_var.group(0)
+                while pos < len(working) and working[pos] == "^":
+                    var_end = chain_var_end(working, pos + 1)
+                    if var_end == pos + 1:
+                        break
+                    var_name = working[pos + 1:var_end]
 
-                        if not chain_assigned_values:
-                            value_to_store = repl
-                        else:
-                            max_attempts = 12
-                            attempt = 0
-                            value_to_store = None
-                            prev_set = set(chain_assigned_values)
-                            last_try = None
-                            while attempt < max_attempts:
-                                attempt += 1
-                                candidate = process_bracket(
-                                    content, seeded_rng, wildcard_dir,
-                                    _resolved_vars=_resolved_vars,
-                                    bracket_ctx=bracket_ctx,
-                                    bracket_overflow=bracket_overflow
-                                )
-                                last_try = candidate
-                                if candidate not in prev_set:
-                                    value_to_store = candidate
-                                    break
-                            if value_to_store is None:
-                                value_to_store = last_try if last_try is not None else repl
-
-                        # restore escaped placeholders before storing in context and before appending for output
-                        restored_value = _restore_escaped_wildcards(value_to_store, _escaped_wildcard_map or {})
-                        # strip internal adjacent-wildcard marker before storing/returning
-                        restored_value = restored_value.replace(_ADJ_WC_MARKER, "")
-
-                        _ensure_var_bucket(_resolved_vars, var_name)
-                        bucket = _resolved_vars[var_name]
-                        origin_key = f"__bracket_{len(bucket)}"
-                        bucket[origin_key] = restored_value
-
-                        chain_assigned_values.append(restored_value)
-
-                        replace_end = pos + 1 + len(var_name)
-                        pos = replace_end
-                        made_assignment = True
-
-                    if made_assignment:
-                        output = ", ".join(chain_assigned_values)
-                        working = working[:br_start] + output + working[replace_end:]
+                    if not chain_assigned_values:
+                        value_to_store = repl
                     else:
-                        working = working[:br_start] + repl + working[br_end + 1:]
+                        max_attempts = 12
+                        attempt = 0
+                        value_to_store = None
+                        prev_set = set(chain_assigned_values)
+                        last_try = None
+                        while attempt < max_attempts:
+                            attempt += 1
+                            candidate = process_bracket(
+                                content, seeded_rng, wildcard_dir,
+                                _resolved_vars=_resolved_vars,
+                                bracket_ctx=bracket_ctx,
+                                bracket_overflow=bracket_overflow
+                            )
+                            last_try = candidate
+                            if candidate not in prev_set:
+                                value_to_store = candidate
+                                break
+                        if value_to_store is None:
+                            value_to_store = last_try if last_try is not None else repl
+
+                    # restore escaped placeholders before storing in context and before appending for output
+                    restored_value = _restore_escaped_wildcards(value_to_store, _escaped_wildcard_map or {})
+                    # strip internal adjacent-wildcard marker before storing/returning
+                    restored_value = restored_value.replace(_ADJ_WC_MARKER, "")
+
+                    _ensure_var_bucket(_resolved_vars, var_name)
+                    bucket = _resolved_vars[var_name]
+                    origin_key = f"__bracket_{len(bucket)}"
+                    bucket[origin_key] = restored_value
+
+                    chain_assigned_values.append(restored_value)
+
+                    replace_end = pos + 1 + len(var_name)
+                    pos = replace_end
+                    made_assignment = True
+
+                if made_assignment:
+                    output = ", ".join(chain_assigned_values)
+                    working = working[cut:br_start] + output + working[replace_end:]
+                else:
+                    working = working[cut:br_start] + repl + working[br_end + 1:]
 
-                    working = _space_adjacent_wildcards(working)
-                    continue
+                working = _space_adjacent_wildcards(working)
+                continue
 
-                full_token = m_file.group(0)
-                wc_name = m_file.group(1)
-                var_tok = m_file.group(2)
+            m_start, m_end, wc_name, var_tok = m_file
+            full_token = working[m_start:m_end]
 
-                replacement = ""
+            replacement = ""
+
+            if wc_name is None and var_tok:
+                # pure variable recall __^var__
+                candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=None)
+                if candidates:
+                    replacement = seeded_rng.choice(candidates)
+                else:
+                    seeded_rng.skip()
+                    # fallback: try to resolve a wildcard file named var_tok (i.e., __var_tok__)
+                    rng_for_this = seeded_rng.next_rng()
+                    generated = process_file_wildcard(var_tok, rng_for_this, wildcard_dir, bracket_ctx=None)
+                    if generated:
+                        replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
+                            generated, seeded_rng, wildcard_dir,
+                            _depth=_depth + 1, _resolved_vars=_resolved_vars,
+                            bracket_ctx=None,
+                            bracket_overflow=bracket_overflow
+                        )
+                    else:
+                        replacement = None
 
-                if wc_name is None and var_tok:
-                    # pure variable recall __^var__
-                    rng_local = seeded_rng.next_rng()
-                    candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=None)
+            elif wc_name is not None and var_tok:
+                # __file^var__ or __name^var__  (assignment or origin-scoped recall)
+                if "*" in var_tok:
+                    candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=wc_name)
                     if candidates:
-                        replacement = rng_local.choice(candidates)
+                        replacement = seeded_rng.choice(candidates)
                     else:
-                        # fallback: try to resolve a wildcard file named var_tok (i.e., __var_tok__)
+                        seeded_rng.skip()
+                        replacement = None
+                else:
+                    bucket = _resolved_vars.get(var_tok, {})
+                    if wc_name in bucket:
+                        replacement = bucket[wc_name]
+                    else:
+                        # generate once and store under var_tok[wildcard_name]
                         rng_for_this = seeded_rng.next_rng()
-                        generated = process_file_wildcard(var_tok, rng_for_this, wildcard_dir, bracket_ctx=None)
-                        if generated:
-                            replacement = resolve_wildcards(
+                        generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=bracket_ctx)
+                        if not _is_fresh_draw(generated, full_token):
+                            replacement = None
+                        else:
+                            replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
                                 generated, seeded_rng, wildcard_dir,
                                 _depth=_depth + 1, _resolved_vars=_resolved_vars,
-                                bracket_ctx=None,
+                                bracket_ctx=bracket_ctx,
                                 bracket_overflow=bracket_overflow
                             )
-                        else:
-                            replacement = None
-
-                elif wc_name is not None and var_tok:
-                    # __file^var__ or __name^var__  (assignment or origin-scoped recall)
-                    if "*" in var_tok:
-                        rng_local = seeded_rng.next_rng()
-                        candidates = _collect_candidates(_resolved_vars, var_tok, origin_filter=wc_name)
-                        if candidates:
-                            replacement = rng_local.choice(candidates)
-                        else:
-                            replacement = None
-                    else:
-                        bucket = _resolved_vars.get(var_tok, {})
-                        if wc_name in bucket:
-                            replacement = bucket[wc_name]
-                        else:
-                            # generate once and store under var_tok[wildcard_name]
-                            rng_for_this = seeded_rng.next_rng()
-                            generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=bracket_ctx)
-                            if not generated or generated == full_token or generated.strip() == full_token.strip():
-                                replacement = None
-                            else:
-                                replacement = resolve_wildcards(
-                                    generated, seeded_rng, wildcard_dir,
-                                    _depth=_depth + 1, _resolved_vars=_resolved_vars,
-                                    bracket_ctx=bracket_ctx,
-                                    bracket_overflow=bracket_overflow
-                                )
-                                _ensure_var_bucket(_resolved_vars, var_tok)
-                                # do not overwrite existing origin value if present
-                                if wc_name not in _resolved_vars[var_tok]:
-                                    to_store = _restore_escaped_wildcards(replacement, _escaped_wildcard_map or {})
-                                    _resolved_vars[var_tok][wc_name] = to_store
+                            _ensure_var_bucket(_resolved_vars, var_tok)
+                            # do not overwrite existing origin value if present
+                            if wc_name not in _resolved_vars[var_tok]:
+                                to_store = _restore_escaped_wildcards(replacement, _escaped_wildcard_map or {})
+                                _resolved_vars[var_tok][wc_name] = to_store
 
+            else:
+                # plain wildcard: __name__
+                rng_for_this = seeded_rng.next_rng()
+                generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=bracket_ctx)
+                if not _is_fresh_draw(generated, full_token):
+                    replacement = None
                 else:
-                    # plain wildcard: __name__
-                    rng_for_this = seeded_rng.next_rng()
-                    generated = process_file_wildcard(wc_name, rng_for_this, wildcard_dir, bracket_ctx=bracket_ctx)
-                    if not generated or generated == full_token or generated.strip() == full_token.strip():
-                        replacement = None
-                    else:
-                        replacement = resolve_wildcards(
-                            generated, seeded_rng, wildcard_dir,
-                            _depth=_depth + 1, _resolved_vars=_resolved_vars,
-                            bracket_ctx=bracket_ctx,
-                            bracket_overflow=bracket_overflow
-                        )
+                    replacement = generated if not _needs_resolution(generated) else resolve_wildcards(
+                        generated, seeded_rng, wildcard_dir,
+                        _depth=_depth + 1, _resolved_vars=_resolved_vars,
+                        bracket_ctx=bracket_ctx,
+                        bracket_overflow=bracket_overflow
+                    )
 
-                if replacement is None:
-                    ph = next_placeholder()
-                    placeholders[ph] = full_token
-                    working = working[:m_file.start()] + ph + working[m_file.end():]
-                else:
-                    working = working[:m_file.start()] + replacement + working[m_file.end():]
-                    changed = True
-                    working = _space_adjacent_wildcards(working)
+            if replacement is None:
+                ph = next_placeholder()
+                placeholders[ph] = full_token
+                working = working[cut:m_start] + ph + working[m_end:]
+            else:
+                working = working[cut:m_start] + replacement + working[m_end:]
+                changed = True
+                working = _space_adjacent_wildcards(working)
+
+        done.append(working)
+        return "".join(done)
 
-            return working
+    max_passes = 12
+    pass_no = 0
+    while pass_no < max_passes:
+        pass_no += 1
+        changed = False
 
         new_text = _single_pass(text)
+        unresolved = bool(placeholders)
 
         if placeholders:
             for ph, orig in placeholders.items():
@@ -1020,12 +1349,13 @@ def resolve_wildcards(text: str,
         text = new_text
         text = _space_adjacent_wildcards(text)
 
-    # Final sweep (no bracket context here)
-    # Final sweep (no bracket context here)
-    text = _final_sweep_resolve(
-        text, seeded_rng, wildcard_dir, _resolved_vars, _depth,
-        escaped_map=_escaped_wildcard_map
-    )
+    # Final sweep (no bracket context here). A pass that changed nothing and
+    # parked no token has already proven there is nothing left for it.
+    if changed or unresolved:
+        text = _final_sweep_resolve(
+            text, seeded_rng, wildcard_dir, _resolved_vars, _depth,
+            escaped_map=_escaped_wildcard_map
+        )
     # RESTORE any protected escaped wildcard placeholders back to literal text
     text = _restore_escaped_wildcards(text, _escaped_wildcard_map)
     text = text.replace(_ADJ_WC_MARKER, "")
@@ -13,6 +13,9 @@ from PIL.PngImagePlugin import PngInfo
 
 from comfy.cli_args import args
 
+_TRAILING_NUMBER_RE = re.compile(r'[_\-\s]*\d+$')
+_WS_RE = re.compile(r'\s+')
+
 
 class SaveImageAndText:
     def __init__(self):
@@ -47,6 +50,7 @@ class SaveImageAndText:
 
     OUTPUT_NODE = True
     CATEGORY = "image"
+    DISPLAY_NAME = "Save Image And Text"
     DESCRIPTION = "Saves input images and also writes a .txt file with user-specified content."
 
     def save_images_and_text(self, images, filename_prefix="ComfyUI", prompt_data="", prompt=None, extra_pnginfo=None):
@@ -161,7 +165,7 @@ class LoadImageAndMeta:
                 return os.path.join(directory, f)
 
         # 3) trim trailing underscores/digits from base and compare
-        trimmed = re.sub(r'[_\-\s]*\d+$', '', base_lower)
+        trimmed = _TRAILING_NUMBER_RE.sub('', base_lower)
         if trimmed != base_lower:
             for f in candidates:
                 name = os.path.splitext(f)[0].lower()
@@ -170,7 +174,7 @@ class LoadImageAndMeta:
 
         # 4) underscore/space normalization: compare both directions
         def normalize_us_space(s: str):
-            return re.sub(r'\s+', ' ', s.replace('_', ' ')).strip()
+            return _WS_RE.sub(' ', s.replace('_', ' ')).strip()
 
         norm_base = normalize_us_space(base_lower)
         for f in candidates:
@@ -23,6 +23,7 @@ class RandomFloats4(ComfyNodeABC):
     RETURN_NAMES = ("value1", "value2", "value3", "value4")
     FUNCTION = "generate"
     CATEGORY = "Math"
+    DISPLAY_NAME = "Random Floats 4"
 
     def generate(self, min_value: float, max_value: float, seed: int) -> Tuple[float, float, float, float]:
         rng = random.Random(seed)
@@ -44,6 +45,7 @@ class RandomIntegers4(ComfyNodeABC):
     RETURN_NAMES = ("value1", "value2", "value3", "value4")
     FUNCTION = "generate"
     CATEGORY = "Math"
+    DISPLAY_NAME = "Random Integers 4"
 
     def generate(self, min_value: int, max_value: int, seed: int) -> Tuple[int, int, int, int]:
         rng = random.Random(seed)
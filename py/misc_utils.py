@@ -25,6 +25,7 @@ class ScaledSeedGenerator(ComfyNodeABC):
     RETURN_NAMES = ("Output A", "Output B", "Output C", "Output D")
     FUNCTION = "generate"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "Scaled Seed Generator 🌱"
 
     def _scaled_random(self, base_seed: int, rate: float) -> int:
         """
@@ -64,6 +65,7 @@ class TagCounter(ComfyNodeABC):
     RETURN_NAMES = ("tag_count",)
     FUNCTION = "count_tags"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "Tag Counter"
 
     def count_tags(self, string: str) -> Tuple[int]:
         # Split by commas and count non-empty stripped elements
@@ -100,6 +102,7 @@ class LoraTagNormalizer:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "normalize"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "Normalize Lora Tags 🟰"
 
     # ---------- helpers ----------
 
@@ -3,6 +3,8 @@ import re
 import random
 from typing import Dict, List, Tuple, Optional
 
+_WS_RE = re.compile(r'\s+')
+
 
 class PromptAliasSwap:
     """
@@ -67,6 +69,7 @@ class PromptAliasSwap:
     RETURN_NAMES = ("Aliased String",)
     FUNCTION = "apply"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Alias Swap 📚"
 
     # ---------------- Cache & file handling ----------------
     _CACHE: Dict[str, dict] = {}
@@ -92,7 +95,7 @@ class PromptAliasSwap:
         t = tok.strip().lower()
         t = t.replace(r'\(', '(').replace(r'\)', ')')
         t = t.replace('-', '_')
-        t = re.sub(r'\s+', '_', t)
+        t = _WS_RE.sub('_', t)
         return t
 
     @classmethod
@@ -9,10 +9,69 @@ Changes:
 - The Advanced version now has the option to Hide Comments, as well as specify a directory for custom wildcards.
 """
 
-import os
+from os.path import abspath, dirname, join
 from .generator import resolve_wildcards, SeededRandom
-from .string_utils import re
 from .wildcard_utils import _normalize_input_context, _ensure_bucket_dict, build_category_options
+from ._wildcard_lex import comment_spans
+
+
+class _ResolveCtx:
+    """
+    State shared by every resolve_wildcards call of one generation: the seeded
+    rng, the wildcard folder and the variable context the calls accumulate into.
+    """
+    __slots__ = ("rng", "wildcard_dir", "vars")
+
+    def __init__(self, rng, wildcard_dir, vars):
+        self.rng = rng
+        self.wildcard_dir = wildcard_dir
+        self.vars = vars
+
+    def resolve(self, text):
+        return resolve_wildcards(text, self.rng, self.wildcard_dir, _resolved_vars=self.vars)
+
+
+def _resolve_comment_blocks(prompt, rctx, hide_comments=True):
+    """
+    Resolve every ##comment## block in a single scan so the variables assigned
+    inside them land in rctx.vars. Returns the prompt with the blocks
+    removed when hide_comments is set, otherwise the prompt unchanged.
+    """
+    if "##" not in prompt:
+        return prompt
+    resolve = rctx.resolve
+    pieces = []
+    last = 0
+    for start, end, body_start, body_end in comment_spans(prompt):
+        resolve(prompt[body_start:body_end])
+        if hide_comments:
+            pieces.append(prompt[last:start])
+            last = end
+    if not hide_comments:
+        return prompt
+    pieces.append(prompt[last:])
+    return "".join(pieces)
+
+def _resolve_prompt(prompt, seed, hide_comments, wildcard_dir, context):
+    """
+    Full comment + prompt resolution shared by both generator nodes.
+    Returns (result, context) with the context normalized to dict-of-dicts.
+    """
+    context = _normalize_input_context(context)
+    rctx = _ResolveCtx(SeededRandom(seed), wildcard_dir, context)
+
+    prompt = _resolve_comment_blocks(prompt, rctx, hide_comments=hide_comments)
+    result = rctx.resolve(prompt)
+
+    #if cleanup:
+    #result = " ".join(result.split())
+
+    # Ensure context buckets are normalized
+    for k, v in list(context.items()):
+        if not isinstance(v, dict):
+            context[k] = _ensure_bucket_dict(v)
+
+    return (result, context)
 
 class PromptGenerator:
     """
@@ -29,51 +88,32 @@ class PromptGenerator:
       - Returns (prompt_string, context_dict) where context_dict is dict-of-dicts.
     """
 
-    def __init__(self):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.input_dir = os.path.join(base_dir, "wildcards")
+    INPUT_DIR = join(dirname(dirname(abspath(__file__))), "wildcards")
+
+    # static, so built once instead of on every frontend poll
+    _INPUT_TYPES = {
+        "required": {
+            "prompt": ("STRING", {"multiline": True}),
+            "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+        },
+        "optional": {
+            "context": ("DICT", {}),  # optional incoming context
+        },
+    }
 
     @classmethod
     def INPUT_TYPES(cls):
-        return {
-            "required": {
-                "prompt": ("STRING", {"multiline": True}),
-                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
-            },
-            "optional": {
-                "context": ("DICT", {}),  # optional incoming context
-            },
-        }
+        return cls._INPUT_TYPES
 
     RETURN_TYPES = ("STRING", "DICT")
     RETURN_NAMES = ("prompt", "context")
     FUNCTION = "process"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Generator 💡"
 
     # ---------- main ----------
     def process(self, prompt, seed, context=None):
-        rng = SeededRandom(seed)
-
-        # Normalize incoming context into dict-of-dicts (origin->value)
-        normalized_context = _normalize_input_context(context)
-
-        comment_blocks = re.findall(r"##(.*?)##", prompt, flags=re.DOTALL)
-        
-        for block in comment_blocks:
-            _ = resolve_wildcards(block, rng, self.input_dir, _resolved_vars=normalized_context)
-        
-        prompt = re.sub(r"##.*?##", "", prompt, flags=re.DOTALL)
-        
-        result = resolve_wildcards(prompt, rng, self.input_dir, _resolved_vars=normalized_context)
-
-        #if cleanup:
-        #result = " ".join(result.split())
-
-        for k, v in list(normalized_context.items()):
-            if not isinstance(v, dict):
-                normalized_context[k] = _ensure_bucket_dict(v)
-
-        return (result, normalized_context)
+        return _resolve_prompt(prompt, seed, True, self.INPUT_DIR, context)
 
 
 
@@ -114,14 +154,10 @@ class PromptGeneratorAdvanced:
     RETURN_NAMES = ("prompt", "context")
     FUNCTION = "process"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Generator 💡 (Advanced)"
 
     # ---------- main ----------
     def process(self, prompt, seed, hide_comments, category=None, context=None):
-        rng = SeededRandom(seed)
-
-        # Normalize incoming context into dict-of-dicts (origin->value)
-        normalized_context = _normalize_input_context(context)
-
         # Map category label to its folder (string only, no os.path.join here!)
         category_label = category if category is not None else (
             getattr(self.__class__, "_CATEGORY_LABELS", ["Default"])[0]
@@ -129,23 +165,7 @@ class PromptGeneratorAdvanced:
         folder_map = getattr(self.__class__, "_CATEGORY_MAP", {}) or {}
         folder_name = folder_map.get(category_label, "wildcards")
 
-        # ----- handle comment blocks first -----
-        comment_blocks = re.findall(r"##(.*?)##", prompt, flags=re.DOTALL)
-        for block in comment_blocks:
-            _ = resolve_wildcards(block, rng, folder_name, _resolved_vars=normalized_context)
-
-        if hide_comments:
-            prompt = re.sub(r"##.*?##", "", prompt)
-
-        # ----- resolve main prompt -----
-        result = resolve_wildcards(prompt, rng, folder_name, _resolved_vars=normalized_context)
-
-        # Ensure context buckets are normalized
-        for k, v in list(normalized_context.items()):
-            if not isinstance(v, dict):
-                normalized_context[k] = _ensure_bucket_dict(v)
-
-        return (result, normalized_context)
+        return _resolve_prompt(prompt, seed, hide_comments, folder_name, context)
 
 
 
@@ -161,19 +181,22 @@ class PromptContextMerge:
       - Output is a dict[var_name] -> dict[origin_key -> value] (the generator.py shape).
     """
 
+    _INPUT_TYPES = {
+        "optional": {
+            "context_a": ("DICT", {}),
+            "context_b": ("DICT", {}),
+            "context_c": ("DICT", {}),
+        }
+    }
+
     @classmethod
     def INPUT_TYPES(cls):
-        return {
-            "optional": {
-                "context_a": ("DICT", {}),
-                "context_b": ("DICT", {}),
-                "context_c": ("DICT", {}),
-            }
-        }
+        return cls._INPUT_TYPES
 
     RETURN_TYPES = ("DICT",)
     FUNCTION = "combine"
     CATEGORY = "adaptiveprompts/context"
+    DISPLAY_NAME = "Prompt Context Merge"
 
     @staticmethod
     def _iter_items_normalized(ctx):
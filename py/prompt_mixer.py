@@ -1,14 +1,16 @@
-import os
+from os.path import abspath, dirname, join
 import re
 import math
 from typing import List, Tuple
 from .generator import resolve_wildcards, SeededRandom
 
+_WS_RE = re.compile(r"\s+")
+
 
 class PromptMixer:
     def __init__(self):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.input_dir = os.path.join(base_dir, "wildcards")
+        base_dir = abspath(join(dirname(__file__), ".."))
+        self.input_dir = join(base_dir, "wildcards")
     """
     Prompt Mix - sprinkle tokens from a 'mix' prompt into a base prompt.
 
@@ -49,6 +51,7 @@ class PromptMixer:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "mix"
     CATEGORY = "prompt"
+    DISPLAY_NAME = "Prompt Mixer 🥣"
 
     # ---------------- helpers ----------------
 
@@ -59,7 +62,7 @@ class PromptMixer:
     @staticmethod
     def _normalize_for_match(tok: str) -> str:
         # collapse whitespace, lower-case for matching / duplication checks
-        return re.sub(r"\s+", " ", tok.strip()).lower()
+        return _WS_RE.sub(" ", tok.strip()).lower()
 
     @staticmethod
     def _joiner_from_base(base: str, delimiter: str) -> str:
@@ -209,8 +212,9 @@ class PromptMixer:
             mix_tokens = [prompt_mix] if prompt_mix else []
         else:
             # split trimming whitespace around delim to canonicalize tokens
-            base_tokens = [self._trim_token(t) for t in re.split(rf'\s*{re.escape(delimiter)}\s*', prompt_base) if t is not None and t != ""]
-            mix_tokens = [self._trim_token(t) for t in re.split(rf'\s*{re.escape(delimiter)}\s*', prompt_mix) if t is not None and t != ""]
+            splitter = re.compile(rf'\s*{re.escape(delimiter)}\s*')
+            base_tokens = [self._trim_token(t) for t in splitter.split(prompt_base) if t is not None and t != ""]
+            mix_tokens = [self._trim_token(t) for t in splitter.split(prompt_mix) if t is not None and t != ""]
 
         # Nothing to do
         if not mix_tokens:
@@ -1,8 +1,91 @@
 import os
 import re
+import bisect
 from typing import Dict, List, Tuple, Optional
 from .generator import SeededRandom
 
+_WEIGHT_SEGMENT_RE = re.compile(r'%[^%]*%')
+_WS_RE = re.compile(r'\s+')
+_WS_TAIL_RE = re.compile(r'(?<=\s)\s')
+_PLACEHOLDER_RE = re.compile(r'__.*?__')
+_NON_WS_RE = re.compile(r'\S+')
+
+# keys are bucketed by their first _SCAN_PREFIX characters for the phrase scan
+_SCAN_PREFIX = 3
+
+
+def _lookahead_alternation(strings):
+    """
+    Compile a zero-width pattern matching at every position where one of strings
+    starts. The alternation is nested as a trie (one branch per distinct next char,
+    leaf chars folded into a class), so the regex engine never retries a shared
+    prefix. None if strings is empty.
+    """
+    trie: dict = {}
+    for s in strings:
+        node = trie
+        for ch in s:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    if not trie:
+        return None
+
+    def emit(node) -> str:
+        if "" in node:
+            # a string ends here: a shorter match is enough for a lookahead
+            return ""
+        leaves = sorted(ch for ch, sub in node.items() if "" in sub)
+        branches = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if "" not in sub]
+        if len(leaves) == 1:
+            branches.append(re.escape(leaves[0]))
+        elif leaves:
+            branches.append("[" + "".join(re.escape(ch) for ch in leaves) + "]")
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return re.compile("(?=" + emit(trie) + ")")
+
+
+def _build_phrase_scan(keys):
+    """
+    Group phrase keys for a single left-to-right scan:
+    ({prefix -> key lengths starting with it}, lengths of keys shorter than the prefix,
+     lookahead pattern finding the positions where any prefix or short key starts),
+    lengths in ascending order so a scan can stop at the first one past the text's end
+    """
+    by_prefix: Dict[str, set] = {}
+    short: set = set()
+    short_keys: set = set()
+    for key in keys:
+        if len(key) < _SCAN_PREFIX:
+            short.add(len(key))
+            short_keys.add(key)
+        else:
+            by_prefix.setdefault(key[:_SCAN_PREFIX], set()).add(len(key))
+    return ({p: tuple(sorted(ls)) for p, ls in by_prefix.items()},
+            tuple(sorted(short)),
+            _lookahead_alternation(list(by_prefix) + list(short_keys)))
+
+
+def _uniform_index_key(s: str) -> str:
+    """
+    Lowercase, trim, and replace any run of whitespace with a single underscore.
+    Do NOT unescape backslashes; do NOT touch underscores/hyphens, etc.
+    """
+    t = s.strip().lower()
+    t = _WS_RE.sub('_', t)
+    return t
+
+
+def _split_wildcard_patterns(patterns) -> Tuple[frozenset, Tuple[str, ...]]:
+    """
+    (exact names, prefixes of 'name*' patterns) for a wildcard blacklist,
+    so a name is checked with one set lookup and one str.startswith.
+    """
+    exact = frozenset(p for p in patterns if p and not p.endswith("*"))
+    prefixes = tuple(p[:-1] for p in patterns if p.endswith("*"))
+    return exact, prefixes
+
+
 class WildcardPreprocessor:
     """
     Loads wildcards from /wildcards and keeps a list of (wildcard_name, raw_line)
@@ -21,8 +104,15 @@ class WildcardPreprocessor:
 
     def __init__(self, wildcard_dir: str):
         self.wildcard_dir = wildcard_dir
-        # store sanitized lines only (no expansion here)
-        self.raw_entries: List[Tuple[str, str]] = []
+        # sanitized lines only (no expansion here):
+        # (wildcard_name, raw_line, index_key); index_key is None for lines with braces,
+        # which can only be keyed after expansion
+        self.preprocessed_entries: List[Tuple[str, str, Optional[str]]] = []
+        # index_key -> wildcard names holding it (first-seen order), for lines without braces
+        self.value_index: Dict[str, List[str]] = {}
+        # filepath -> (st_mtime_ns, st_size, sanitized lines); a refresh only
+        # re-reads the files whose stat changed
+        self._file_cache: Dict[str, Tuple[int, int, List[Tuple[str, Optional[str]]]]] = {}
 
     # ----------- helpers for parsing ------------
 
@@ -44,7 +134,7 @@ class WildcardPreprocessor:
         Remove all chance weight %...% segments
         """
         # remove multiple occurrences if present
-        return re.sub(r'%[^%]*%', '', line)
+        return _WEIGHT_SEGMENT_RE.sub('', line)
 
     @staticmethod
     def _has_commas(line: str) -> bool:
@@ -99,14 +189,18 @@ class WildcardPreprocessor:
 
     def preprocess(self):
         """
-        Build sanitized raw_entries list: (wildcard_name, raw_line) without brace expansion.
+        Build sanitized preprocessed_entries: (wildcard_name, raw_line, index_key) without brace expansion.
         wildcard_name is derived from the .txt relative path (without extension), using '/' as sep.
         """
-        self.raw_entries.clear()
+        self.preprocessed_entries.clear()
+        self.value_index = {}
 
         if not os.path.isdir(self.wildcard_dir):
+            self._file_cache.clear()
             return
 
+        # collect files in walk order first: entry order decides group order in the indices
+        files_to_read: List[Tuple[str, str]] = []
         for root, _, files in os.walk(self.wildcard_dir):
             for filename in sorted(files):
                 if not filename.endswith(".txt"):
@@ -114,29 +208,88 @@ class WildcardPreprocessor:
                 filepath = os.path.join(root, filename)
                 rel_path = os.path.relpath(filepath, self.wildcard_dir)
                 wildcard_name = os.path.splitext(rel_path)[0].replace("\\", "/")
+                files_to_read.append((wildcard_name, filepath))
+
+        # reuse the parsed lines of every file whose mtime and size are unchanged
+        old_cache = self._file_cache
+        cache: Dict[str, Tuple[int, int, List[Tuple[str, Optional[str]]]]] = {}
+        stale: List[Tuple[str, int, int]] = []
+        for _, fp in files_to_read:
+            try:
+                st = os.stat(fp)
+            except OSError:
+                continue
+            hit = old_cache.get(fp)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                cache[fp] = hit
+            else:
+                stale.append((fp, st.st_mtime_ns, st.st_size))
 
-                try:
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        for raw in f:
-                            s = raw.strip()
-                            if not s or s.startswith('#') or s.startswith('!'):
-                                continue
-                            # trim comments, weights, and whitespace
-                            s = self._strip_inline_comments(raw)
-                            s = self._strip_weights(s).strip()
-                            if not s:
-                                continue
-                            # red-flag screen
-                            if self._is_red_flag_line(s):
-                                continue
-                            # keep the sanitized line (no expansion here)
-                            self.raw_entries.append((wildcard_name, s))
-                except OSError:
-                    # Skip unreadable file
-                    continue
+        for fp, mtime_ns, size in stale:
+            text = self._read_text(fp)
+            if text is None:
+                # Skip unreadable file
+                continue
+            cache[fp] = (mtime_ns, size, self._sanitized_lines(text))
+        # files that were deleted (or became unreadable) drop out here
+        self._file_cache = cache
+
+        for wildcard_name, fp in files_to_read:
+            hit = cache.get(fp)
+            if hit is None:
+                continue
+            for s, key in hit[2]:
+                self.preprocessed_entries.append((wildcard_name, s, key))
+                if key:
+                    names = self.value_index.setdefault(key, [])
+                    if wildcard_name not in names:
+                        names.append(wildcard_name)
+
+    @staticmethod
+    def _read_text(filepath: str) -> Optional[str]:
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @classmethod
+    def _sanitized_lines(cls, text: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Sanitized (line, index_key) pairs of one wildcard file's text.
+        Text mode has already turned every line ending into '\n', so splitting
+        on it matches iterating the file.
+        """
+        out: List[Tuple[str, Optional[str]]] = []
+        for raw in text.split("\n"):
+            s = raw.strip()
+            if not s or s[0] == '#' or s[0] == '!':
+                continue
+            # trim comments, weights, and whitespace (only when present)
+            if '#' in s:
+                s = cls._strip_inline_comments(s)
+            if '%' in s:
+                s = cls._strip_weights(s).strip()
+            if not s:
+                continue
+            # red-flag screen
+            has_brace = '{' in s or '}' in s
+            if ',' in s or '__' in s:
+                continue
+            if has_brace and cls._is_red_flag_line(s):
+                continue
+            # keep the sanitized line (no expansion here)
+            out.append((s, None if has_brace else _uniform_index_key(s)))
+        return out
 
     def get_raw_entries(self) -> List[Tuple[str, str]]:
-        return list(self.raw_entries)
+        return [(name, line) for name, line, _ in self.preprocessed_entries]
+
+    def get_preprocessed_entries(self) -> List[Tuple[str, str, Optional[str]]]:
+        return list(self.preprocessed_entries)
+
+    def get_value_index(self) -> Dict[str, List[str]]:
+        return self.value_index
 
 class PromptRepack:
     """
@@ -190,6 +343,7 @@ class PromptRepack:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "repack"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Repack 📦"
 
     # ------------------- init & paths -------------------
 
@@ -197,16 +351,25 @@ class PromptRepack:
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         self.wildcard_dir = os.path.join(base_dir, "wildcards")
         self.rewrapper_dir = os.path.join(base_dir, "repack_files")
+        # the wildcard folder is read on the first repack() call, not when the
+        # node is created
         self.preprocessor = WildcardPreprocessor(self.wildcard_dir)
-        self.preprocessor.preprocess()
+        self._preprocessed = False
 
         self._last_blacklist_file: Optional[str] = None
+        # (st_mtime_ns, st_size) of the loaded blacklist file, None if it was missing
+        self._blacklist_stat: Optional[Tuple[int, int]] = None
         self._word_blacklist: set = set()
-        self._wildcard_blacklist_patterns: List[str] = []
+        # wildcard blacklist split into exact names and 'name*' prefixes
+        self._wildcard_blacklist_exact: frozenset = frozenset()
+        self._wildcard_blacklist_prefixes: Tuple[str, ...] = ()
 
         # cache of indices keyed by (matching_mode, index_brackets)
         # value shape: { "word": {key -> [groups]}, "phrase": {key -> [groups]} }
         self._indices_cache: Dict[Tuple[str, bool], Dict[str, Dict[str, List[str]]]] = {}
+        # the same indices with blacklisted groups (and keys left without groups) removed,
+        # valid for the loaded blacklist; also holds "phrase_scan" for the phrase keys
+        self._allowed_cache: Dict[Tuple[str, bool], Dict[str, object]] = {}
 
     # ------------------- blacklist helpers -------------------
 
@@ -225,25 +388,23 @@ class PromptRepack:
         else:
             return ("word", s.lower())
 
-    def _is_wildcard_blacklisted(self, wildcard_name: str, patterns) -> bool:
+    def _is_wildcard_blacklisted(self, wildcard_name: str) -> bool:
         name = wildcard_name.lower()
-        for pat in patterns:
-            if not pat:
-                continue
-            if pat.endswith("*"):
-                if name.startswith(pat[:-1]):
-                    return True
-            else:
-                if name == pat:
-                    return True
-        return False
+        return name in self._wildcard_blacklist_exact or name.startswith(self._wildcard_blacklist_prefixes)
+
+    def _blacklist_file_stat(self, filename) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(os.path.join(self.rewrapper_dir, filename))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
 
     def load_blacklist(self, filename):
-        """Return a tuple (word_blacklist, wildcard_blacklist_patterns)."""
+        """Return a tuple (word_blacklist, exact_wildcard_names, wildcard_name_prefixes)."""
         path = os.path.join(self.rewrapper_dir, filename)
         words, wildcard_patterns = set(), []
         if not os.path.exists(path):
-            return words, wildcard_patterns
+            return (words,) + _split_wildcard_patterns(wildcard_patterns)
         with open(path, "r", encoding="utf-8") as f:
             for raw in f:
                 parsed = self._parse_blacklist_line(raw)
@@ -254,19 +415,13 @@ class PromptRepack:
                     words.add(value)
                 else:
                     wildcard_patterns.append(value)
-        return words, wildcard_patterns
+        return (words,) + _split_wildcard_patterns(wildcard_patterns)
 
     # ------------------- uniform indexing & brace expansion -------------------
 
     @staticmethod
     def _uniform_index_key(s: str) -> str:
-        """
-        Lowercase, trim, and replace any run of whitespace with a single underscore.
-        Do NOT unescape backslashes; do NOT touch underscores/hyphens, etc.
-        """
-        t = s.strip().lower()
-        t = re.sub(r'\s+', '_', t)
-        return t
+        return _uniform_index_key(s)
 
     @staticmethod
     def _has_brace(s: str) -> bool:
@@ -316,28 +471,48 @@ class PromptRepack:
             out.append("".join(seg))
         return out
 
+    @staticmethod
+    def _same_brackets_entry(cache: dict, index_brackets: bool):
+        """
+        Index keys are normalized the same way for every matching mode (the mode only
+        changes how the input text is normalized), so an entry built for another mode
+        with the same index_brackets can be shared as-is.
+        """
+        for (_, other_brackets), entry in cache.items():
+            if other_brackets == index_brackets:
+                return entry
+        return None
+
     def _build_indices(self, matching_mode: str, index_brackets: bool):
         cache_key = (matching_mode, index_brackets)
         if cache_key in self._indices_cache:
             return
+        shared = self._same_brackets_entry(self._indices_cache, index_brackets)
+        if shared is not None:
+            self._indices_cache[cache_key] = shared
+            return
 
         word_index: Dict[str, List[str]] = {}
         phrase_index: Dict[str, List[str]] = {}
 
-        entries = self.preprocessor.get_raw_entries()
+        if not index_brackets:
+            # brace lines are skipped, so the preprocessor's index already holds every key
+            for key, names in self.preprocessor.get_value_index().items():
+                # classify by underscore presence: phrases contain '_', words do not
+                (phrase_index if '_' in key else word_index)[key] = list(names)
+            self._indices_cache[cache_key] = {"word": word_index, "phrase": phrase_index}
+            return
 
-        for wildcard_name, value in entries:
-            # If this line contains any braces and user doesn't want bracket indexing, skip it
-            if self._has_brace(value):
-                if not index_brackets:
-                    continue
-                # expand non-nested braces into all combos
-                expanded_values = self._expand_braces_non_nested(value)
+        entries = self.preprocessor.get_preprocessed_entries()
+
+        for wildcard_name, value, value_key in entries:
+            if value_key is not None:
+                keys = (value_key,)
             else:
-                expanded_values = [value]
+                # expand non-nested braces into all combos
+                keys = [self._uniform_index_key(v) for v in self._expand_braces_non_nested(value)]
 
-            for v in expanded_values:
-                key = self._uniform_index_key(v)
+            for key in keys:
                 if not key:
                     continue
                 # classify by underscore presence: phrases contain '_', words do not
@@ -350,6 +525,36 @@ class PromptRepack:
 
         self._indices_cache[cache_key] = {"word": word_index, "phrase": phrase_index}
 
+    def _build_allowed_indices(self, matching_mode: str, index_brackets: bool):
+        """
+        Filter the indices for (matching_mode, index_brackets) through the wildcard blacklist
+        once, so the replacement passes can use the groups they look up as-is.
+        """
+        cache_key = (matching_mode, index_brackets)
+        if cache_key in self._allowed_cache:
+            return
+        shared = self._same_brackets_entry(self._allowed_cache, index_brackets)
+        if shared is not None:
+            self._allowed_cache[cache_key] = shared
+            return
+        self._build_indices(matching_mode, index_brackets)
+        indices = self._indices_cache[cache_key]
+
+        # check each wildcard name once, not once per key it is indexed under
+        names = {g for index in indices.values() for groups in index.values() for g in groups}
+        blocked = {g for g in names if self._is_wildcard_blacklisted(g)}
+
+        allowed_indices: Dict[str, object] = {}
+        for kind, index in indices.items():
+            allowed_index: Dict[str, List[str]] = {}
+            for key, groups in index.items():
+                allowed = [g for g in groups if g not in blocked] if blocked else groups
+                if allowed:
+                    allowed_index[key] = allowed
+            allowed_indices[kind] = allowed_index
+        allowed_indices["phrase_scan"] = _build_phrase_scan(allowed_indices["phrase"])
+        self._allowed_cache[cache_key] = allowed_indices
+
     # ------------------- text normalization for search -------------------
 
     @staticmethod
@@ -360,6 +565,22 @@ class PromptRepack:
         - ignore_case:  lower()
         - flexible:     lower() + spaces→underscore (runs collapse to single '_')
         """
+        if mode == "exact":
+            return text, list(range(len(text)))
+
+        lowered = text.lower()
+        # whole-string lower() matches per-character lower() except where a char
+        # expands (e.g. 'İ') or for the context-sensitive final sigma; those
+        # take the per-character path below
+        if len(lowered) == len(text) and 'Σ' not in text:
+            if mode == "ignore_case":
+                return lowered, list(range(len(text)))
+            # flexible: each whitespace run maps to its first index, so every
+            # whitespace char after the first of its run is masked out of the map
+            masked = _WS_TAIL_RE.sub('\0', text.replace('\0', '\1'))
+            idx_map = [i for i, ch in enumerate(masked) if ch != '\0']
+            return _WS_RE.sub('_', lowered), idx_map
+
         out_chars: List[str] = []
         idx_map: List[int] = []
 
@@ -394,167 +615,166 @@ class PromptRepack:
         return "".join(out_chars), idx_map
 
     @staticmethod
-    def _iter_boundary_matches(haystack: str, needle: str, alnum_set=r"[A-Za-z0-9_]"):
+    def _iter_phrase_hits(norm_text: str, phrase_index: Dict[str, List[str]], phrase_scan):
         """
-        Find non-overlapping occurrences of needle in haystack with token boundaries:
-        (?<![A-Za-z0-9_])needle(?![A-Za-z0-9_])
+        Yield (pos, key) for every (possibly overlapping) occurrence of any phrase key.
+        One pass over the text: the compiled lookahead skips to positions where some
+        key's prefix starts, and there only the key lengths sharing that prefix are
+        sliced and looked up, instead of one str.find sweep per key.
         """
-        if not needle:
+        by_prefix, short, positions = phrase_scan
+        if positions is None:
             return
-        pat = re.compile(rf"(?<!{alnum_set}){re.escape(needle)}(?!{alnum_set})")
-        for m in pat.finditer(haystack):
-            yield m.start(), m.end()
+        text_len = len(norm_text)
+        for m in positions.finditer(norm_text):
+            pos = m.start()
+            room = text_len - pos
+            lengths = by_prefix.get(norm_text[pos:pos + _SCAN_PREFIX])
+            if lengths:
+                for n in lengths:
+                    if n > room:
+                        # longer keys cannot fit before the end of the text
+                        break
+                    key = norm_text[pos:pos + n]
+                    if key in phrase_index:
+                        yield pos, key
+            for n in short:
+                if n > room:
+                    break
+                key = norm_text[pos:pos + n]
+                if key in phrase_index:
+                    yield pos, key
 
     # ------------------- core matching passes -------------------
 
     def _replace_phrases_first(self, text: str, phrase_index: Dict[str, List[str]],
                                matching_mode: str, rng: SeededRandom,
-                               chance: float) -> str:
+                               chance: float, phrase_scan=None) -> str:
         """
         Longest (underscore-joined) phrase replacement, then words.
         Avoids replacing inside existing __placeholders__.
+        phrase_index must already be blacklist-filtered (see _build_allowed_indices).
         """
         if not phrase_index:
             return text
+        # every phrase key holds a '_', and normalizing only makes one out of
+        # whitespace (flexible): without either, a single word or an
+        # exact/ignore_case prompt cannot hold a phrase
+        if '_' not in text and (matching_mode != "flexible" or not _WS_RE.search(text)):
+            return text
+        if phrase_scan is None:
+            phrase_scan = _build_phrase_scan(phrase_index)
 
         norm_text, idx_map = self._normalize_for_search(text, matching_mode)
         # find existing placeholders to avoid overlapping replacements
-        placeholder_spans = [(m.start(), m.end()) for m in re.finditer(r'__.*?__', text)]
+        placeholder_spans = [(m.start(), m.end()) for m in _PLACEHOLDER_RE.finditer(text)]
 
         # Build candidates: (start_orig, end_orig, allowed_groups[List[str]])
         candidates: List[Tuple[int, int, List[str]]] = []
 
-        # Sort keys by length descending to prefer longer phrases
-        keys_by_len = sorted(phrase_index.keys(), key=len, reverse=True)
+        for pos, key in self._iter_phrase_hits(norm_text, phrase_index, phrase_scan):
+            s_orig = idx_map[pos]
+            e_orig = idx_map[pos + len(key) - 1] + 1
 
-        for key in keys_by_len:
-            start = 0
-            while True:
-                pos = norm_text.find(key, start)
-                if pos == -1:
+            # skip overlaps with existing placeholders
+            overlapped = False
+            for ps, pe in placeholder_spans:
+                if not (e_orig <= ps or pe <= s_orig):
+                    overlapped = True
                     break
-                start = pos + 1
-                s_orig = idx_map[pos]
-                e_orig = idx_map[pos + len(key) - 1] + 1
-
-                # skip overlaps with existing placeholders
-                overlapped = False
-                for ps, pe in placeholder_spans:
-                    if not (e_orig <= ps or pe <= s_orig):
-                        overlapped = True
-                        break
-                if overlapped:
-                    continue
+            if overlapped:
+                continue
 
-                groups = phrase_index[key]
-                allowed = [g for g in groups if not self._is_wildcard_blacklisted(g, self._wildcard_blacklist_patterns)]
-                if allowed:
-                    candidates.append((s_orig, e_orig, allowed))
+            candidates.append((s_orig, e_orig, phrase_index[key]))
 
         if not candidates:
             return text
 
         # Keep non-overlapping longest-first
         candidates.sort(key=lambda t: (-(t[1] - t[0]), t[0]))
+        # selected spans are disjoint, so kept sorted by start only the neighbours
+        # on either side of a new span can overlap it
         selected: List[Tuple[int, int, List[str]]] = []
-
-        def overlaps(a, b):
-            return not (a[1] <= b[0] or b[1] <= a[0])
+        sel_starts: List[int] = []
 
         for span in candidates:
-            if any(overlaps((span[0], span[1]), (s[0], s[1])) for s in selected):
+            s, e = span[0], span[1]
+            i = bisect.bisect_right(sel_starts, s)
+            if i and selected[i - 1][1] > s:
+                continue
+            if i < len(sel_starts) and sel_starts[i] < e:
                 continue
             # chance roll per candidate span
-            if rng.next_rng().random() > chance:
+            if rng.exceeds(chance):
                 continue
-            selected.append(span)
+            sel_starts.insert(i, s)
+            selected.insert(i, span)
 
         if not selected:
             return text
 
-        selected.sort(key=lambda t: t[0])
         out, last = [], 0
         for s, e, allowed_groups in selected:
             out.append(text[last:s])
-            chosen = rng.next_rng().choice(allowed_groups)
+            chosen = rng.choice(allowed_groups)
             out.append(f"__{chosen}__")
             last = e
         out.append(text[last:])
         return "".join(out)
 
-    def _key_from_token(self, token: str, matching_mode: str) -> str:
-        """
-        Build comparison key from a single token (no surrounding whitespace).
-        """
-        if matching_mode == "exact":
-            return token
-        elif matching_mode == "ignore_case":
-            return token.lower()
-        else:  # flexible
-            # tokens won't usually have spaces, but keep symmetry
-            t = token.lower()
-            t = re.sub(r'\s+', '_', t)
-            return t
-
     def _replace_words(self, text: str, word_index: Dict[str, List[str]],
                        matching_mode: str, rng: SeededRandom,
                        chance: float) -> str:
         """
         Per-word pass preserving spacing/punctuation. Skips existing __placeholders__ tokens.
+        word_index must already be blacklist-filtered (see _build_allowed_indices).
         """
         if not word_index:
             return text
 
+        # Batch the lookups: peel, lowercase and probe every token in
+        # comprehensions, then walk only the tokens with a hit. str.split()
+        # splits on exactly the characters \S+ stops at, so token i here is
+        # match i of _NON_WS_RE.
+        cores = [t.rstrip(",.!?;:") for t in text.split()]
+        # a \S+ token has no whitespace, so flexible keys are just the lowercase form
+        keys = cores if matching_mode == "exact" else [c.lower() for c in cores]
+        hits = [i for i, key in enumerate(keys) if key in word_index]
+        if not hits:
+            return text
+        spans = [m.span() for m in _NON_WS_RE.finditer(text)]
+
+        # only replaced tokens cut the text: everything between two of them,
+        # skipped tokens included, is copied as a single slice
         out = []
         last = 0
-        for m in re.finditer(r'\S+', text):
-            out.append(text[last:m.start()])
-            token = m.group(0)
-
-            # don't touch placeholders
-            if token.startswith("__") and token.endswith("__"):
-                out.append(token)
-                last = m.end()
-                continue
-
-            # peel simple trailing punctuation
-            core = token
-            trailing = ""
-            while core and core[-1] in ",.!?;:":
-                trailing = core[-1] + trailing
-                core = core[:-1]
+        blacklist = self._word_blacklist
+        for i in hits:
+            core = cores[i]
             if not core:
-                out.append(token)
-                last = m.end()
                 continue
 
-            # word blacklist (plain lowercase)
-            if core.lower() in self._word_blacklist:
-                out.append(token)
-                last = m.end()
+            # don't touch placeholders, also when punctuation follows them
+            # ("__name__," left by the phrase pass)
+            if core.startswith("__") and core.endswith("__"):
                 continue
 
-            key = self._key_from_token(core, matching_mode)
-            groups = word_index.get(key)
-            if not groups:
-                out.append(token)
-                last = m.end()
+            # word blacklist (plain lowercase)
+            if core.lower() in blacklist:
                 continue
 
-            allowed = [g for g in groups if not self._is_wildcard_blacklisted(g, self._wildcard_blacklist_patterns)]
+            allowed = word_index[keys[i]]
             if not allowed:
-                out.append(token)
-                last = m.end()
                 continue
 
-            if rng.next_rng().random() > chance:
-                out.append(token)
-                last = m.end()
+            if rng.exceeds(chance):
                 continue
 
-            chosen = rng.next_rng().choice(allowed)
-            out.append(f"__{chosen}__{trailing}")
-            last = m.end()
+            chosen = rng.choice(allowed)
+            start, end = spans[i]
+            out.append(text[last:start])
+            out.append(f"__{chosen}__{text[start + len(core):end]}")
+            last = end
 
         out.append(text[last:])
         return "".join(out)
@@ -565,22 +785,28 @@ class PromptRepack:
                index_brackets: bool, chance: float, seed: int,
                blacklist_file: str, refresh_cache: bool = False):
 
-        # Refresh wildcards and indices if asked
-        if refresh_cache:
+        # Load wildcards on first use, refresh them and the indices if asked
+        if refresh_cache or not self._preprocessed:
             self.preprocessor.preprocess()
+            self._preprocessed = True
             self._indices_cache.clear()
-            self._last_blacklist_file = None
+            self._allowed_cache.clear()
 
-        # (Re)load blacklist if new file or after refresh
-        if self._last_blacklist_file != blacklist_file:
-            self._word_blacklist, self._wildcard_blacklist_patterns = self.load_blacklist(blacklist_file)
+        # (Re)load blacklist if another file is picked or the file itself changed
+        blacklist_stat = self._blacklist_file_stat(blacklist_file)
+        if self._last_blacklist_file != blacklist_file or self._blacklist_stat != blacklist_stat:
+            (self._word_blacklist, self._wildcard_blacklist_exact,
+             self._wildcard_blacklist_prefixes) = self.load_blacklist(blacklist_file)
             self._last_blacklist_file = blacklist_file
+            self._blacklist_stat = blacklist_stat
+            self._allowed_cache.clear()
 
-        # Build indices for current settings
-        self._build_indices(matching_mode, index_brackets)
+        # Build blacklist-filtered indices for current settings
+        self._build_allowed_indices(matching_mode, index_brackets)
         cache_key = (matching_mode, index_brackets)
-        word_index = self._indices_cache[cache_key]["word"]
-        phrase_index = self._indices_cache[cache_key]["phrase"]
+        word_index = self._allowed_cache[cache_key]["word"]
+        phrase_index = self._allowed_cache[cache_key]["phrase"]
+        phrase_scan = self._allowed_cache[cache_key]["phrase_scan"]
 
         rng = SeededRandom(seed)
 
@@ -589,6 +815,7 @@ class PromptRepack:
             return (out,)
 
         # phrases first, then words
-        with_phrases = self._replace_phrases_first(string, phrase_index, matching_mode, rng, chance)
+        with_phrases = self._replace_phrases_first(string, phrase_index, matching_mode, rng, chance,
+                                                  phrase_scan)
         out = self._replace_words(with_phrases, word_index, matching_mode, rng, chance)
         return (out,)
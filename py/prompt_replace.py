@@ -1,15 +1,13 @@
 import re
-import os
+from os.path import abspath, dirname, join
 from .generator import resolve_wildcards, SeededRandom
 from .wildcard_utils import _normalize_input_context, _ensure_bucket_dict, build_category_options
-from .prompt_generator import *
-from .wildcard_utils import *
 
 class PromptReplace:
 
     def __init__(self):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.input_dir = os.path.join(base_dir, "wildcards")
+        base_dir = abspath(join(dirname(__file__), ".."))
+        self.input_dir = join(base_dir, "wildcards")
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -36,6 +34,7 @@ class PromptReplace:
     RETURN_NAMES = ("prompt", "context")
     FUNCTION = "replace"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Replace 🔁"
 
     def replace(self, string, target_string, replace_string, seed, limit, category=None, context=None):
         seeded_rng = SeededRandom(seed)
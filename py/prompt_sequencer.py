@@ -8,70 +8,13 @@ Prompt Sequencer node for ComfyUI
 - Modes: FROM_START, FROM_END, PARALLEL
 """
 
-import re
 import os
 import itertools
 from typing import List, Tuple
 from .wildcard_utils import build_category_options, _default_package_root
-
-# Regex to recognize __file__ and optional ^var (we ignore ^var in sequencing)
-FILE_PATTERN = re.compile(r"__(?:([a-zA-Z0-9_\-/*]+?))?(?:\^([a-zA-Z0-9_\-\*]+))?__")
-
-# Reused helper: split top-level pipes inside braces (preserve exact segments)
-def _split_top_level_pipes(s: str) -> List[str]:
-    parts = []
-    buf = []
-    depth = 0
-    i = 0
-    L = len(s)
-    while i < L:
-        c = s[i]
-        if c == "{":
-            depth += 1
-            buf.append(c)
-        elif c == "}":
-            if depth > 0:
-                depth -= 1
-            buf.append(c)
-        elif c == "|" and depth == 0:
-            parts.append("".join(buf))
-            buf = []
-        else:
-            buf.append(c)
-        i += 1
-    parts.append("".join(buf))
-    return parts
-
-# Load weighted file lines (supports %w% weights, but sequencing uses order of items)
-def _parse_weighted_options(lines_iterable):
-    items, weights = [], []
-    for raw in lines_iterable:
-        line = raw.rstrip("\n")
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        # remove inline comments after unescaped '#'
-        cleaned = re.split(r'(?<!\\)#', line)[0].strip()
-        if not cleaned:
-            continue
-        m = re.search(r'(?<!\\)%([0-9]*\.?[0-9]+)%', cleaned)
-        if m:
-            w = float(m.group(1))
-            cleaned = (cleaned[:m.start()] + cleaned[m.end():]).strip()
-        else:
-            w = 1.0
-        cleaned = cleaned.replace(r'\%', '%')
-        if cleaned:
-            items.append(cleaned)
-            weights.append(w)
-    return items, weights
-
-def _load_weighted_file(filepath: str) -> Tuple[List[str], List[float]]:
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return _parse_weighted_options(f)
-    except OSError:
-        return [], []
+# Regex, pipe splitting and %w% file parsing are shared with the Prompt Generator
+# (sequencing ignores ^var and weights, and uses the order of items).
+from .generator import FILE_PATTERN, _split_top_level_pipes, _load_weighted_file
 
 # Helper: try primary path first, then fallback to package 'wildcards' folder
 def _load_weighted_file_with_fallback(fname: str, wildcard_dir: str) -> Tuple[List[str], List[float]]:
@@ -290,6 +233,7 @@ class PromptSequencer:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "sequence"
     CATEGORY = "adaptiveprompts/generation"
+    DISPLAY_NAME = "Prompt Sequencer 🎞️"
 
     def sequence(self, prompt: str, seed: int, mode: str, category=None, ):
         """
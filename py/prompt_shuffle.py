@@ -23,6 +23,7 @@ class PromptShuffle:
     RETURN_NAMES = ("shuffled_string",)
     FUNCTION = "shuffle_strings"
     CATEGORY = "adaptiveprompts/processing"
+    DISPLAY_NAME = "Prompt Shuffle ♻️"
 
     def shuffle_strings(self, string: str, separator: str, limit: int, seed: int) -> Tuple[str]:
         """
@@ -140,6 +141,7 @@ class PromptShuffleAdvanced:
     RETURN_NAMES = ("shuffled_string",)
     FUNCTION = "shuffleAdvanced"
     CATEGORY = "adaptiveprompts/processing"
+    DISPLAY_NAME = "Prompt Shuffle ♻️ (Advanced)"
 
     def shuffleAdvanced(self,
                         string: str,
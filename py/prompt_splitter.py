@@ -74,6 +74,7 @@ class PromptSplitter:
     RETURN_NAMES = ("Trimmed", "Scraps")
     FUNCTION = "process"
     CATEGORY = "adaptiveprompts/processing"
+    DISPLAY_NAME = "Prompt Splitter ✂️"
 
     def process(self, string, quantity, quantity_mode, keep_first_sections, mode, delimiter, seed):
         # Split prompt
@@ -12,6 +12,11 @@ from comfy.cli_args import args
 from comfy.comfy_types import ComfyNodeABC, InputTypeDict
 
 LORA_PATTERN = re.compile(r"<lora:[^>]+>")
+MULTI_WS_PATTERN = re.compile(r"[ \t]{2,}")
+COMMA_WS_PATTERN = re.compile(r"[ \t]*,[ \t]*")
+LEADING_COMMA_PATTERN = re.compile(r"^[ \t]*,[ \t]*")
+TRAILING_COMMA_PATTERN = re.compile(r"[ \t]*,[ \t]*$")
+EMPTY_COMMA_PATTERN = re.compile(r",[ \t]*,")
 
 class PromptCleanup:
     @classmethod
@@ -30,6 +35,7 @@ class PromptCleanup:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "process"
     CATEGORY = "adaptiveprompts/processing"
+    DISPLAY_NAME = "Prompt Cleanup 🧹"
 
     @staticmethod
     def _remove_unmatched(s: str, open_ch: str, close_ch: str) -> str:
@@ -56,7 +62,7 @@ class PromptCleanup:
     def process(string, cleanup_commas, cleanup_newlines, cleanup_whitespace, remove_lora_tags, fix_brackets):
         # Stage 1: Remove LoRA tags
         if remove_lora_tags:
-            string = re.sub(LORA_PATTERN, "", string)
+            string = LORA_PATTERN.sub("", string)
 
         # Stage 2: Replace newlines with space
         if cleanup_newlines == "space":
@@ -67,16 +73,16 @@ class PromptCleanup:
         # Stage 3: Remove empty comma sections
         if cleanup_commas:
             # Iteratively remove leading commas
-            while re.match(r"^[ \t]*,[ \t]*", string):
-                string = re.sub(r"^[ \t]*,[ \t]*", "", string)
+            while LEADING_COMMA_PATTERN.match(string):
+                string = LEADING_COMMA_PATTERN.sub("", string)
 
             # Iteratively remove trailing commas
-            while re.search(r"[ \t]*,[ \t]*$", string):
-                string = re.sub(r"[ \t]*,[ \t]*$", "", string)
+            while TRAILING_COMMA_PATTERN.search(string):
+                string = TRAILING_COMMA_PATTERN.sub("", string)
 
             # Remove empty comma sections inside the string
-            while re.search(r",[ \t]*,", string):
-                string = re.sub(r",[ \t]*,", ",", string)
+            while EMPTY_COMMA_PATTERN.search(string):
+                string = EMPTY_COMMA_PATTERN.sub(",", string)
 
         # Stage 4: Fix stray brackets
         if fix_brackets != "false":
@@ -88,8 +94,11 @@ class PromptCleanup:
         # Stage 5: Whitespace cleanup
         if cleanup_whitespace:
             string = string.strip(" \t")
-            string = re.sub(r"[ \t]{2,}", " ", string)              # collapse spaces/tabs
-            string = re.sub(r"[ \t]*,[ \t]*", ", ", string)         # normalize comma spacing
+            # substring checks are far cheaper than a regex scan on already-clean prompts
+            if "  " in string or "\t" in string:
+                string = MULTI_WS_PATTERN.sub(" ", string)          # collapse spaces/tabs
+            if "," in string:
+                string = COMMA_WS_PATTERN.sub(", ", string)         # normalize comma spacing
 
         return (string,)
 
@@ -111,6 +120,7 @@ class StringAppend3:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "merge_strings"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "String Append 🔗"
 
     @staticmethod
     def merge_strings(string_1, string_2, string_3, combine_mode):
@@ -153,6 +163,7 @@ class StringAppend8:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "merge_strings"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "String Append 🔗"
 
     @staticmethod
     def merge_strings(string_1, string_2, string_3, string_4, string_5, string_6, string_7, string_8, combine_mode):
@@ -209,6 +220,7 @@ class StringSplit(ComfyNodeABC):
     RETURN_NAMES = ("String A", "String B", "String C")
     FUNCTION = "split_string"
     CATEGORY = "adaptiveprompts/utils"
+    DISPLAY_NAME = "String Split ⛓️‍💥"
 
     def split_string(self, text: str, start: int, end: int, delimiter: str):
         # Safety: empty delimiter is useless, default to ","
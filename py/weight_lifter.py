@@ -3,6 +3,12 @@ import math
 from typing import List, Tuple, Dict
 from .generator import SeededRandom
 
+_WS_RE = re.compile(r"\s+")
+_LEADING_WS_RE = re.compile(r'^\s*')
+_TRAILING_WS_RE = re.compile(r'\s*$')
+_PAREN_GROUP_RE = re.compile(r'^\(\s*(.*)\s*\)$', re.DOTALL)
+_TRAILING_WEIGHT_RE = re.compile(r'^(.*?)(?:\s*:\s*([0-9]+(?:\.[0-9]+)?))\s*$', re.DOTALL)
+
 
 class WeightLifter:
     """
@@ -61,6 +67,7 @@ class WeightLifter:
     RETURN_TYPES = ("STRING",)
     FUNCTION = "process"
     CATEGORY = "adaptiveprompts/processing"
+    DISPLAY_NAME = "Weight Lifter 🏋️‍♀️"
 
     # ----------------- helpers -----------------
 
@@ -69,8 +76,8 @@ class WeightLifter:
     def _parse_keywords(self, text): return [k.strip() for k in text.split(",") if k.strip()]
 
     def _is_keyword(self, tag, kws):
-        t = re.sub(r"\s+", " ", tag.lower()).replace("_", " ")
-        return any(re.sub(r"\s+", " ", k.lower()).replace("_", " ") in t for k in kws)
+        t = _WS_RE.sub(" ", tag.lower()).replace("_", " ")
+        return any(_WS_RE.sub(" ", k.lower()).replace("_", " ") in t for k in kws)
 
     def _baseline(self, min_w, max_w): return 1.0 if min_w <= 1.0 <= max_w else (min_w + max_w) / 2.0
 
@@ -183,16 +190,16 @@ class WeightLifter:
                 continue
 
             # Preserve leading/trailing whitespace exactly (we'll reuse them when reconstructing)
-            leading_ws = re.match(r'^\s*', seg).group(0)
-            trailing_ws = re.search(r'\s*$', seg).group(0)
+            leading_ws = _LEADING_WS_RE.match(seg).group(0)
+            trailing_ws = _TRAILING_WS_RE.search(seg).group(0)
             core = seg[len(leading_ws):len(seg) - len(trailing_ws)]
 
             # Detect an outer parenthesis group that wraps the whole core (e.g. "(tag:0.7)")
-            m_paren = re.match(r'^\(\s*(.*)\s*\)$', core, flags=re.DOTALL)
+            m_paren = _PAREN_GROUP_RE.match(core)
             inner_core = m_paren.group(1) if m_paren else core
 
             # Detect existing numeric weight at the end: capture text and number
-            m_w = re.match(r'^(.*?)(?:\s*:\s*([0-9]+(?:\.[0-9]+)?))\s*$', inner_core, flags=re.DOTALL)
+            m_w = _TRAILING_WEIGHT_RE.match(inner_core)
             if m_w:
                 text_raw = m_w.group(1)
                 existing = float(m_w.group(2))
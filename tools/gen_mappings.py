@@ -0,0 +1,131 @@
+"""
+Adaptive Prompts: gen_mappings
+Regenerates py/_mappings.py, the static node table read by py/_registry.py
+
+Display names come from the DISPLAY_NAME attribute of each node class, which is
+the single source of truth. The classes are read with ast rather than imported,
+so this runs without ComfyUI, torch or PIL installed.
+
+Usage:
+  python tools/gen_mappings.py          # rewrite py/_mappings.py
+  python tools/gen_mappings.py --check  # exit 1 if py/_mappings.py is stale
+"""
+
+import ast
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PY_DIR = os.path.join(ROOT, "py")
+OUT_PATH = os.path.join(PY_DIR, "_mappings.py")
+
+# (node_name, module, class_name) in registration order
+NODE_TABLE = [
+    ("PromptGenerator", "prompt_generator", "PromptGenerator"),
+    ("PromptGeneratorAdvanced", "prompt_generator", "PromptGeneratorAdvanced"),
+    ("PromptSequencer", "prompt_sequencer", "PromptSequencer"),
+    ("PromptRepack", "prompt_repack", "PromptRepack"),
+    ("PromptAliasSwap", "prompt_alias", "PromptAliasSwap"),
+    ("PromptReplace", "prompt_replace", "PromptReplace"),
+    ("WeightLifter", "weight_lifter", "WeightLifter"),
+    ("PromptSplitter", "prompt_splitter", "PromptSplitter"),
+    ("PromptMixer", "prompt_mixer", "PromptMixer"),
+    ("PromptShuffle", "prompt_shuffle", "PromptShuffle"),
+    ("PromptShuffleAdvanced", "prompt_shuffle", "PromptShuffleAdvanced"),
+    ("PromptContextMerge", "prompt_generator", "PromptContextMerge"),
+    ("PromptCleanup", "string_utils", "PromptCleanup"),
+    ("NormalizeLoraTags", "misc_utils", "LoraTagNormalizer"),
+    ("StringSplit", "string_utils", "StringSplit"),
+    ("StringAppend3", "string_utils", "StringAppend3"),
+    ("StringAppend8", "string_utils", "StringAppend8"),
+    ("ScaledSeedGenerator", "misc_utils", "ScaledSeedGenerator"),
+    ("TagCounter", "misc_utils", "TagCounter"),
+    ("SaveImageAndText", "image_nodes", "SaveImageAndText"),
+    ("RandomFloats", "math_utils", "RandomFloats4"),
+    ("RandomIntegers", "math_utils", "RandomIntegers4"),
+]
+
+HEADER = '''"""
+Adaptive Prompts: _mappings
+GENERATED by tools/gen_mappings.py -- do not edit by hand.
+
+Edit a node's DISPLAY_NAME (or NODE_TABLE in the generator) and re-run it.
+"""
+'''
+
+
+def read_display_names(module):
+    """
+    Return {class_name: DISPLAY_NAME} for every class in py/<module>.py that defines one.
+    """
+    with open(os.path.join(PY_DIR, module + ".py"), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for stmt in node.body:
+            if (isinstance(stmt, ast.Assign)
+                    and any(isinstance(t, ast.Name) and t.id == "DISPLAY_NAME" for t in stmt.targets)
+                    and isinstance(stmt.value, ast.Constant)):
+                names[node.name] = stmt.value.value
+    return names
+
+
+def render():
+    cache = {}
+    rows = []
+    for node_name, module, cls_name in NODE_TABLE:
+        if module not in cache:
+            cache[module] = read_display_names(module)
+        try:
+            display = cache[module][cls_name]
+        except KeyError:
+            raise SystemExit(f"{module}.{cls_name} has no DISPLAY_NAME")
+        rows.append((node_name, module, cls_name, display))
+
+    out = [HEADER, "import sys", "",
+           "# (node_name, module (relative to this package), class_name, display_name)",
+           "_NODES_RAW = ("]
+    for row in rows:
+        out.append("    (%s)," % ", ".join(_quote(v) for v in row))
+    out += [
+        ")",
+        "",
+        "# interned so every registry holding these names/labels shares one object",
+        "NODES = tuple(tuple(map(sys.intern, row)) for row in _NODES_RAW)",
+        "",
+        "NODE_DISPLAY_NAME_MAPPINGS = {n: d for n, _, _, d in NODES}",
+        "",
+    ]
+    return "\n".join(out)
+
+
+def _quote(s):
+    # double quotes to match the rest of the package; keep emoji/ZWJ literal
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def main(argv):
+    text = render()
+    try:
+        with open(OUT_PATH, "r", encoding="utf-8") as f:
+            current = f.read()
+    except OSError:
+        current = None
+
+    if "--check" in argv:
+        if current != text:
+            print("py/_mappings.py is out of date; run python tools/gen_mappings.py")
+            return 1
+        return 0
+
+    if current != text:
+        with open(OUT_PATH, "w", encoding="utf-8") as f:
+            f.write(text)
+        print("wrote py/_mappings.py")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))